@@ -4,12 +4,35 @@ Learning Progress Tracker Application
 A Flask-based web application for tracking your 12-month learning journey
 """
 
-from flask import Flask, render_template, request, jsonify, send_from_directory
+from flask import (Flask, render_template, request, jsonify, send_from_directory, stream_with_context,
+                   g, has_request_context)
+from werkzeug.local import LocalProxy
+from collections import OrderedDict
+from array import array
+import atexit
+import base64
+import bisect
+import contextlib
+import csv
+import functools
+import heapq
+import io
+import itertools
 import json
+import math
 import os
-from datetime import datetime, timedelta
+import queue
+import re
+from datetime import date, datetime, timedelta
 import uuid
-from typing import Dict, List, Any
+import zlib
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, the single-process rule is not enforced
+    fcntl = None
+from typing import Dict, List, Any, Optional
+import sqlite3
+import sys
 import threading
 import time
 
@@ -18,13 +41,56 @@ app.secret_key = 'your-secret-key-for-learning-tracker'
 
 # Configuration
 DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
-PROGRESS_FILE = os.path.join(DATA_DIR, 'progress.json')
-SESSIONS_FILE = os.path.join(DATA_DIR, 'sessions.json')
-GOALS_FILE = os.path.join(DATA_DIR, 'goals.json')
+SQLITE_FILE = os.path.join(DATA_DIR, 'tracker.db')
+
+# Storage engine: 'json' (files + session journal) or 'sqlite'
+STORAGE_BACKEND = os.environ.get('TRACKER_STORAGE', 'json')
+
+# Session listing pages
+SESSION_PAGE_SIZE = 20
+SESSION_PAGE_MAX = 100
+
+# Full-text search over session notes and topics
+SEARCH_TOPIC_WEIGHT = 3  # a topic tag counts as this many mentions in the notes
+SEARCH_RESULTS_MAX = 100
+TOKEN_PATTERN = re.compile(r'\w+')
+QUERY_PATTERN = re.compile(r'"([^"]*)"|(\S+)')  # quoted phrases or bare words
+
+# Live session streams (Server-Sent Events)
+SSE_HEARTBEAT_INTERVAL = 15  # seconds between heartbeats carrying the current duration
+SSE_RETRY_MS = 3000  # client reconnect delay
+
+# Multi-user partitions: data/users/<user_id>/ (the default user stays in DATA_DIR)
+USERS_DIR = os.path.join(DATA_DIR, 'users')
+DEFAULT_USER = 'default'
+USER_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+TRACKER_CACHE_SIZE = int(os.environ.get('TRACKER_CACHE_SIZE', 64))  # loaded user trackers
+TRACKER_IDLE_TIMEOUT = float(os.environ.get('TRACKER_IDLE_TIMEOUT', 900))  # seconds
+
+# Active (in-progress) sessions: 'memory' or 'sqlite' (kept on disk, so they survive a restart)
+ACTIVE_SESSIONS_FILE = os.path.join(DATA_DIR, 'active_sessions.db')
+ACTIVE_SESSION_BACKEND = os.environ.get('TRACKER_ACTIVE_SESSIONS', 'memory')
 
 # Ensure data directory exists
 os.makedirs(DATA_DIR, exist_ok=True)
 
+# Streamed exports
+EXPORT_CHUNK_SIZE = 64 * 1024  # characters per yielded chunk
+EXPORT_MIMETYPES = {
+    'json': 'application/json',
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv'
+}
+
+# Write-behind persistence for progress.json/goals.json
+FLUSH_INTERVAL = float(os.environ.get('TRACKER_FLUSH_INTERVAL', 0.5))  # seconds between flushes
+FLUSH_MAX_PENDING = 100  # flush early once this many writes are waiting
+FSYNC_POLICY = os.environ.get('TRACKER_FSYNC', 'always')  # 'always' or 'never'
+
+# Prometheus metrics served at /metrics (per worker process)
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)  # seconds
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)  # bytes
+
 # Learning Plan Configuration
 LEARNING_PLAN = {
     'start_date': '2025-07-15',  # Your actual start date
@@ -33,6 +99,8 @@ LEARNING_PLAN = {
     'weekly_target': 36,  # hours per week
     'weekday_target': 4,  # hours per weekday
     'weekend_target': 8,  # hours per weekend day
+    'daily_targets': None,  # optional [Mon, ..., Sun] hours; overrides weekday/weekend targets
+    'rest_days': [],  # ISO dates with no target, or {date: hours} for custom targets
     'stages': {
         1: {
             'name': 'Core Programming + Data Foundations', 
@@ -205,18 +273,1276 @@ LEARNING_PLAN = {
     }
 }
 
+# Plan calendar lookups, computed once instead of on every request
+PLAN_START = datetime.strptime(LEARNING_PLAN['start_date'], '%Y-%m-%d')
+WEEK_TO_STAGE = {
+    week: stage_num
+    for stage_num, stage_info in LEARNING_PLAN['stages'].items()
+    for week in stage_info['weeks']
+}
+
+def normalize_topic(topic: str) -> str:
+    """Case- and punctuation-insensitive key for a topic name"""
+    return ' '.join(TOKEN_PATTERN.findall(topic.casefold()))
+
+def build_plan_topic_keys() -> Dict[str, tuple]:
+    """Normalized names and parenthesised aliases of every plan topic -> (stage, topic index)"""
+    keys = {}
+    for stage_num, stage_info in LEARNING_PLAN['stages'].items():
+        for index, topic in enumerate(stage_info['topics']):
+            # 'Python Advanced Features (decorators, generators)' also matches each part on its own
+            head, _, detail = topic.partition('(')
+            for alias in [topic, head] + detail.rstrip(')').split(','):
+                key = normalize_topic(alias)
+                if key:
+                    keys.setdefault(key, (stage_num, index))  # earlier stages win shared aliases
+    return keys
+
+PLAN_TOPIC_KEYS = build_plan_topic_keys()
+
+class PlanCalendar:
+    """Expected study hours computed in closed form from per-weekday targets and rest days"""
+    
+    def __init__(self, start_date: date, weekday_targets: List[float], rest_days=None):
+        self.start_ordinal = start_date.toordinal()
+        self.weekday_targets = list(weekday_targets)  # 0=Monday, 6=Sunday
+        self.week_sum = sum(self.weekday_targets)
+        
+        # cycle_prefix[k] = hours in the first k days of any plan week
+        start_weekday = start_date.weekday()
+        self.cycle_prefix = [0.0]
+        for offset in range(7):
+            self.cycle_prefix.append(
+                self.cycle_prefix[-1] + self.weekday_targets[(start_weekday + offset) % 7]
+            )
+        
+        # Rest days become sorted (ordinal, delta from the normal target) with a running sum
+        if isinstance(rest_days, dict):
+            overrides = {date.fromisoformat(day): hours for day, hours in rest_days.items()}
+        else:
+            overrides = {date.fromisoformat(day): 0.0 for day in rest_days or []}
+        self.override_ordinals = []
+        self.override_prefix = [0.0]
+        for day in sorted(overrides):
+            if day.toordinal() < self.start_ordinal:
+                continue
+            self.override_ordinals.append(day.toordinal())
+            self.override_prefix.append(
+                self.override_prefix[-1] + overrides[day] - self.weekday_targets[day.weekday()]
+            )
+        self.override_targets = {day.toordinal(): hours for day, hours in overrides.items()}
+        
+        self._memo = {}
+    
+    def target_for(self, day: date) -> float:
+        """Target hours for a single day"""
+        return self.override_targets.get(day.toordinal(), self.weekday_targets[day.weekday()])
+    
+    def expected_hours(self, day: date) -> float:
+        """Total target hours from the start date through day (inclusive)"""
+        ordinal = day.toordinal()
+        if ordinal in self._memo:
+            return self._memo[ordinal]
+        
+        days = ordinal - self.start_ordinal + 1
+        if days <= 0:
+            total = 0.0
+        else:
+            full_weeks, remainder = divmod(days, 7)
+            total = full_weeks * self.week_sum + self.cycle_prefix[remainder]
+            total += self.override_prefix[bisect.bisect_right(self.override_ordinals, ordinal)]
+        
+        self._memo[ordinal] = total
+        return total
+
+
+PLAN_CALENDAR = PlanCalendar(
+    PLAN_START.date(),
+    LEARNING_PLAN['daily_targets']
+    or [LEARNING_PLAN['weekday_target']] * 5 + [LEARNING_PLAN['weekend_target']] * 2,
+    LEARNING_PLAN['rest_days']
+)
+
+class StreakIndex:
+    """Learning days stored as sorted, non-overlapping runs of consecutive days"""
+    
+    def __init__(self):
+        self.run_starts = []  # date ordinals, sorted
+        self.run_ends = []  # inclusive, parallel to run_starts
+        self.longest = 0
+    
+    def add_day(self, day: date):
+        """Mark a day as learned, extending or merging the neighbouring runs"""
+        ordinal = day.toordinal()
+        i = bisect.bisect_right(self.run_starts, ordinal)
+        
+        if i > 0 and self.run_ends[i - 1] >= ordinal:
+            return  # Already inside a run
+        
+        joins_previous = i > 0 and self.run_ends[i - 1] == ordinal - 1
+        joins_next = i < len(self.run_starts) and self.run_starts[i] == ordinal + 1
+        
+        if joins_previous and joins_next:
+            # Backdated day bridging two runs
+            self.run_ends[i - 1] = self.run_ends[i]
+            del self.run_starts[i]
+            del self.run_ends[i]
+            i -= 1
+        elif joins_previous:
+            self.run_ends[i - 1] = ordinal
+            i -= 1
+        elif joins_next:
+            self.run_starts[i] = ordinal
+        else:
+            self.run_starts.insert(i, ordinal)
+            self.run_ends.insert(i, ordinal)
+        
+        self.longest = max(self.longest, self.run_ends[i] - self.run_starts[i] + 1)
+    
+    def current(self, today: date) -> int:
+        """Length of the run ending today or yesterday, otherwise 0"""
+        if not self.run_ends:
+            return 0
+        last_end = self.run_ends[-1]
+        if last_end > today.toordinal():
+            # Future-dated entries; find the run covering today or yesterday
+            i = bisect.bisect_right(self.run_starts, today.toordinal()) - 1
+            if i < 0:
+                return 0
+            last_end = min(self.run_ends[i], today.toordinal())
+            start = self.run_starts[i]
+        else:
+            start = self.run_starts[-1]
+        if last_end < today.toordinal() - 1:
+            return 0
+        return last_end - start + 1
+    
+    def intervals(self, min_days: int = 1) -> List[Dict]:
+        """Historical streaks, oldest first"""
+        return [
+            {
+                'start_date': date.fromordinal(start).isoformat(),
+                'end_date': date.fromordinal(end).isoformat(),
+                'days': end - start + 1
+            }
+            for start, end in zip(self.run_starts, self.run_ends)
+            if end - start + 1 >= min_days
+        ]
+
+EPOCH = datetime(1970, 1, 1)
+EPOCH_ORDINAL = EPOCH.toordinal()
+DAY_US = 86400 * 1000000
+HOUR_US = 3600 * 1000000
+
+def to_epoch_us(value: str) -> int:
+    """Wall-clock microseconds since the epoch for an ISO timestamp (any UTC offset is ignored)"""
+    delta = datetime.fromisoformat(value).replace(tzinfo=None) - EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+def from_epoch_us(value: int) -> str:
+    return (EPOCH + timedelta(microseconds=value)).isoformat()
+
+_topic_sets = {}  # shared tuples for identical topic lists
+
+def intern_topics(topics) -> tuple:
+    key = tuple(sys.intern(topic) for topic in topics or ())
+    return _topic_sets.setdefault(key, key)
+
+class SessionRecord:
+    """Compact in-memory form of a completed session; to_dict() gives the stored/API form"""
+    
+    __slots__ = ('id', 'user_id', 'start', 'end', 'duration', 'paused_time', 'notes', 'topics',
+                 'mood', 'difficulty', 'status', 'manual_entry', 'extra')
+    
+    FIELDS = frozenset(('id', 'user_id', 'start_time', 'end_time', 'duration', 'paused_time', 'notes',
+                        'topics', 'mood', 'difficulty', 'status', 'manual_entry'))
+    
+    @classmethod
+    def from_dict(cls, session: Dict) -> 'SessionRecord':
+        record = cls()
+        record.id = session.get('id') or ''
+        user_id = session.get('user_id')
+        record.user_id = sys.intern(user_id) if isinstance(user_id, str) else user_id
+        record.duration = float(session.get('duration', 0))
+        record.paused_time = session.get('paused_time')
+        record.notes = session.get('notes') or ''
+        record.topics = intern_topics(session.get('topics'))
+        record.mood = sys.intern(session.get('mood') or '')
+        record.difficulty = session.get('difficulty')
+        record.status = sys.intern(session.get('status') or 'completed')
+        record.manual_entry = session.get('manual_entry')
+        
+        # Keep anything that would not survive the round trip verbatim
+        extra = {key: value for key, value in session.items() if key not in cls.FIELDS}
+        record.start = to_epoch_us(session['start_time'])
+        if from_epoch_us(record.start) != session['start_time']:
+            extra['start_time'] = session['start_time']
+        end_time = session.get('end_time')
+        record.end = to_epoch_us(end_time) if end_time else None
+        if end_time and from_epoch_us(record.end) != end_time:
+            extra['end_time'] = end_time
+        record.extra = extra or None
+        return record
+    
+    def to_dict(self) -> Dict:
+        session = {
+            'id': self.id,
+            'user_id': self.user_id,
+            'start_time': from_epoch_us(self.start),
+            'end_time': from_epoch_us(self.end) if self.end is not None else None,
+            'duration': self.duration,
+            'notes': self.notes,
+            'topics': list(self.topics),
+            'mood': self.mood,
+            'difficulty': self.difficulty,
+            'status': self.status
+        }
+        if self.paused_time is not None:
+            session['paused_time'] = self.paused_time
+        if self.manual_entry is not None:
+            session['manual_entry'] = self.manual_entry
+        if self.extra:
+            session.update(self.extra)
+        return session
+    
+    def day_ordinal(self) -> int:
+        """Date ordinal of the start time"""
+        return EPOCH_ORDINAL + self.start // DAY_US
+    
+    def end_day_ordinal(self) -> int:
+        return EPOCH_ORDINAL + (self.end if self.end is not None else self.start) // DAY_US
+    
+    def hour(self) -> int:
+        """Hour of the day of the start time"""
+        return self.start % DAY_US // HOUR_US
+
+class SessionTimeIndex:
+    """Completed sessions sorted by (start time, id), with a parallel epoch array for bisect"""
+    
+    def __init__(self, sessions: List[SessionRecord] = ()):
+        ordered = sorted(sessions, key=self.key)
+        self.sessions = ordered
+        self.starts = array('q', [session.start for session in ordered])  # epoch microseconds
+        self.durations = array('d', [session.duration for session in ordered])
+    
+    @staticmethod
+    def key(session: SessionRecord) -> tuple:
+        return (session.start, session.id)
+    
+    def position(self, key: tuple) -> int:
+        """Index of the first session whose (start, id) is not below key"""
+        start, session_id = key
+        i = bisect.bisect_left(self.starts, start)
+        # Sessions starting at the same instant are ordered by id
+        while i < len(self.starts) and self.starts[i] == start and self.sessions[i].id < session_id:
+            i += 1
+        return i
+    
+    def add(self, session: SessionRecord):
+        i = self.position(self.key(session))
+        self.starts.insert(i, session.start)
+        self.durations.insert(i, session.duration)
+        self.sessions.insert(i, session)
+    
+    def bounds(self, start: str = None, end: str = None) -> tuple:
+        """Index slice of sessions with start <= start_time < end (ISO strings)"""
+        lo = bisect.bisect_left(self.starts, to_epoch_us(start)) if start else 0
+        hi = bisect.bisect_left(self.starts, to_epoch_us(end)) if end else len(self.starts)
+        return lo, hi
+    
+    def range(self, start: str = None, end: str = None) -> List[SessionRecord]:
+        """Sessions starting in [start, end), oldest first"""
+        lo, hi = self.bounds(start, end)
+        return self.sessions[lo:hi]
+    
+    def totals(self, start: str = None, end: str = None) -> Dict:
+        """Hours and session count for sessions starting in [start, end)"""
+        lo, hi = self.bounds(start, end)
+        return {'hours': sum(self.durations[lo:hi]), 'sessions': hi - lo}
+    
+    def bucket_totals(self, boundaries: List[int]) -> List[tuple]:
+        """(hours, sessions) between each pair of consecutive epoch-microsecond boundaries"""
+        positions = [bisect.bisect_left(self.starts, boundary) for boundary in boundaries]
+        return [
+            (sum(self.durations[lo:hi]), hi - lo) for lo, hi in zip(positions, positions[1:])
+        ]
+    
+    def recent(self, limit: int) -> List[SessionRecord]:
+        """Newest sessions first"""
+        return self.sessions[:-limit - 1:-1] if limit > 0 else []
+    
+    def page(self, limit: int, before: tuple = None, start: str = None, end: str = None) -> tuple:
+        """Newest-first page of sessions older than the key `before`; returns (sessions, next key)"""
+        lo, hi = self.bounds(start, end)
+        if before is not None:
+            hi = min(hi, self.position(before))
+        first = max(lo, hi - limit)
+        page = self.sessions[first:hi][::-1]
+        next_key = self.key(self.sessions[first]) if first > lo else None
+        return page, next_key
+
+class SearchIndex:
+    """Inverted index of note and topic words to posting lists of document numbers"""
+    
+    BM25_K1 = 1.2
+    BM25_B = 0.75
+    
+    def __init__(self, sessions: List[SessionRecord] = ()):
+        self.sessions = []  # document number -> session, in the order they were added
+        self.lengths = array('l')  # words per document
+        self.total_length = 0
+        self.postings = {}  # word -> (document numbers ascending, weighted term frequencies)
+        for session in sessions:
+            self.add(session)
+    
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        return TOKEN_PATTERN.findall(text.casefold()) if text else []
+    
+    @classmethod
+    def parse_query(cls, query: str) -> tuple:
+        """Split a query into AND-ed words and quoted phrases; hyphenated words count as phrases"""
+        terms, phrases = [], []
+        for phrase, word in QUERY_PATTERN.findall(query):
+            if word == 'AND':
+                continue
+            tokens = cls.tokenize(phrase or word)
+            if len(tokens) > 1:
+                phrases.append(tokens)
+            elif tokens:
+                terms.append(tokens[0])
+        return terms, phrases
+    
+    def add(self, session: SessionRecord):
+        document = len(self.sessions)
+        self.sessions.append(session)
+        
+        note_words = self.tokenize(session.notes)
+        weights = {}
+        for word in note_words:
+            weights[word] = weights.get(word, 0) + 1
+        topic_words = [word for topic in session.topics for word in self.tokenize(topic)]
+        for word in topic_words:
+            weights[word] = weights.get(word, 0) + SEARCH_TOPIC_WEIGHT
+        
+        length = len(note_words) + len(topic_words)
+        self.lengths.append(length)
+        self.total_length += length
+        for word, weight in weights.items():
+            posting = self.postings.get(word)
+            if posting is None:
+                posting = self.postings[word] = (array('l'), array('l'))
+            posting[0].append(document)
+            posting[1].append(weight)
+    
+    @staticmethod
+    def phrase_pattern(phrase: List[str]):
+        """Regex matching the words consecutively, separated only by non-word characters"""
+        return re.compile(r'(?<!\w)' + r'\W+'.join(map(re.escape, phrase)) + r'(?!\w)')
+    
+    @staticmethod
+    def contains_phrase(session: SessionRecord, pattern) -> bool:
+        """Whether the phrase appears in the notes or within a single topic"""
+        return any(pattern.search(text.casefold()) for text in (session.notes,) + session.topics)
+    
+    def search(self, terms: List[str], phrases: List[List[str]], start: int = None, end: int = None,
+               limit: int = 20) -> tuple:
+        """Best-matching sessions (BM25) containing every word and phrase; returns (total, [(score, session)])"""
+        words = list(dict.fromkeys(terms + [word for phrase in phrases for word in phrase]))
+        if not words:
+            return 0, []
+        postings = []
+        for word in words:
+            posting = self.postings.get(word)
+            if posting is None:
+                return 0, []
+            postings.append(posting)
+        # Walk the rarest word's list and probe the others by bisect
+        postings.sort(key=lambda posting: len(posting[0]))
+        
+        count = len(self.sessions)
+        average_length = self.total_length / count or 1
+        idfs = [math.log(1 + (count - len(documents) + 0.5) / (len(documents) + 0.5)) for documents, _ in postings]
+        k1, b = self.BM25_K1, self.BM25_B
+        patterns = [self.phrase_pattern(phrase) for phrase in phrases]
+        
+        matches = []
+        rarest, others = postings[0], postings[1:]
+        for document, weight in zip(*rarest):
+            frequencies = [weight]
+            for documents, weights in others:
+                i = bisect.bisect_left(documents, document)
+                if i == len(documents) or documents[i] != document:
+                    break
+                frequencies.append(weights[i])
+            else:
+                session = self.sessions[document]
+                if (start is not None and session.start < start) or (end is not None and session.start >= end):
+                    continue
+                if patterns and not all(self.contains_phrase(session, pattern) for pattern in patterns):
+                    continue
+                norm = k1 * (1 - b + b * self.lengths[document] / average_length)
+                score = sum(idf * tf * (k1 + 1) / (tf + norm) for idf, tf in zip(idfs, frequencies))
+                matches.append((score, session.start, document))
+        
+        best = heapq.nlargest(limit, matches)  # newer sessions win ties
+        return len(matches), [(score, self.sessions[document]) for score, _, document in best]
+
+class TopicIndex:
+    """Hours, session count and last study day per topic, and per plan topic they match"""
+    
+    def __init__(self, topics: Dict = None, plan: Dict = None):
+        self.topics = topics or {}  # normalized topic -> [label, hours, sessions, last day ordinal]
+        self.plan = plan or {}  # 'stage.index' -> [hours, sessions, last day ordinal]
+    
+    @classmethod
+    def build(cls, sessions: List[SessionRecord]) -> 'TopicIndex':
+        index = cls()
+        for session in sessions:
+            index.add(session)
+        return index
+    
+    @classmethod
+    def from_state(cls, state: Dict) -> 'TopicIndex':
+        return cls(state['topics'], state['plan'])
+    
+    def to_state(self) -> Dict:
+        return {'topics': self.topics, 'plan': self.plan}
+    
+    @staticmethod
+    def count(entry: list, hours: float, day: int):
+        entry[-3] += hours
+        entry[-2] += 1
+        entry[-1] = max(entry[-1], day)
+    
+    def add(self, session: SessionRecord):
+        """Split the session's hours evenly across its distinct topics"""
+        labels = {}
+        for topic in session.topics:
+            key = normalize_topic(topic)
+            if key:
+                labels.setdefault(key, topic.strip())
+        if not labels:
+            return
+        
+        share = session.duration / len(labels)
+        day = session.day_ordinal()
+        plan_hours = {}
+        for key, label in labels.items():
+            entry = self.topics.get(key)
+            if entry is None:
+                entry = self.topics[key] = [label, 0.0, 0, day]
+            self.count(entry, share, day)
+            match = PLAN_TOPIC_KEYS.get(key)
+            if match is not None:
+                plan_key = f'{match[0]}.{match[1]}'
+                plan_hours[plan_key] = plan_hours.get(plan_key, 0.0) + share
+        
+        # Tags that map onto the same plan topic count as one session of it
+        for plan_key, hours in plan_hours.items():
+            entry = self.plan.get(plan_key)
+            if entry is None:
+                entry = self.plan[plan_key] = [0.0, 0, day]
+            self.count(entry, hours, day)
+    
+    def plan_totals(self, stage_num: int, index: int) -> tuple:
+        """(hours, sessions, last day ordinal or None) for one plan topic"""
+        entry = self.plan.get(f'{stage_num}.{index}')
+        return tuple(entry) if entry else (0.0, 0, None)
+    
+    def unplanned(self) -> List[list]:
+        """Entries for topics that match nothing in the plan"""
+        return [entry for key, entry in self.topics.items() if key not in PLAN_TOPIC_KEYS]
+
+class RollupStore:
+    """Hours, sessions and distinct topics per day, ISO week, month and plan stage"""
+    
+    TIERS = ('day', 'week', 'month', 'stage')
+    
+    def __init__(self):
+        self.tiers = {tier: {} for tier in self.TIERS}  # tier -> period key -> [hours, sessions, topic set]
+        self._keys = {}  # tier -> sorted period keys, dropped when a new period appears
+    
+    @classmethod
+    def build(cls, sessions: List[SessionRecord], stage_of) -> 'RollupStore':
+        rollups = cls()
+        for session in sessions:
+            rollups.add(session, stage_of(session))
+        return rollups
+    
+    @classmethod
+    def from_state(cls, state: Dict) -> 'RollupStore':
+        rollups = cls()
+        names = state['topics']
+        for tier, buckets in state['tiers'].items():
+            rollups.tiers[tier] = {
+                key: [hours, sessions, {names[i] for i in topics}] for key, (hours, sessions, topics) in buckets.items()
+            }
+        return rollups
+    
+    def to_state(self) -> Dict:
+        """JSON form with topics stored once and referenced by position"""
+        names = sorted(set().union(*(bucket[2] for bucket in self.tiers['month'].values())))
+        position = {name: i for i, name in enumerate(names)}
+        return {
+            'topics': names,
+            'tiers': {
+                tier: {
+                    key: [hours, sessions, sorted(position[name] for name in topics)]
+                    for key, (hours, sessions, topics) in buckets.items()
+                }
+                for tier, buckets in self.tiers.items()
+            }
+        }
+    
+    @staticmethod
+    def day_key(day: date) -> str:
+        return day.isoformat()
+    
+    @staticmethod
+    def week_key(day: date) -> str:
+        year, week, _ = day.isocalendar()
+        return f'{year}-W{week:02d}'  # sorts chronologically, like the day and month keys
+    
+    @staticmethod
+    def month_key(day: date) -> str:
+        return day.isoformat()[:7]
+    
+    def add(self, session: SessionRecord, stage_num: Optional[int]):
+        day = date.fromordinal(session.day_ordinal())
+        topics = {normalize_topic(topic) for topic in session.topics}
+        topics.discard('')
+        periods = {'day': self.day_key(day), 'week': self.week_key(day), 'month': self.month_key(day)}
+        if stage_num is not None:
+            periods['stage'] = str(stage_num)
+        
+        for tier, key in periods.items():
+            bucket = self.tiers[tier].get(key)
+            if bucket is None:
+                bucket = self.tiers[tier][key] = [0.0, 0, set()]
+                self._keys.pop(tier, None)
+            bucket[0] += session.duration
+            bucket[1] += 1
+            bucket[2].update(topics)
+    
+    def keys(self, tier: str) -> List[str]:
+        if tier not in self._keys:
+            self._keys[tier] = sorted(self.tiers[tier], key=int if tier == 'stage' else None)
+        return self._keys[tier]
+    
+    def series(self, tier: str, first: str = None, last: str = None) -> List[tuple]:
+        """(period, bucket) rows of one tier with first <= period <= last"""
+        keys = self.keys(tier)
+        lo = bisect.bisect_left(keys, first) if first is not None else 0
+        hi = bisect.bisect_right(keys, last) if last is not None else len(keys)
+        buckets = self.tiers[tier]
+        return [(key, buckets[key]) for key in keys[lo:hi]]
+    
+    def cover(self, start: date, end: date) -> List[tuple]:
+        """(tier, period) pieces that exactly tile the days start..end, using the coarsest that fit"""
+        pieces = []
+        # Whole months first, then whole ISO weeks and single days for the partial months at either end
+        first_month = start if start.day == 1 else (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+        month = first_month
+        while month <= end:
+            following = (month.replace(day=28) + timedelta(days=4)).replace(day=1)
+            if following - timedelta(days=1) > end:
+                break
+            pieces.append(('month', self.month_key(month)))
+            month = following
+        if month == first_month:
+            return self.cover_weeks(start, end)
+        return self.cover_weeks(start, first_month - timedelta(days=1)) + pieces + self.cover_weeks(month, end)
+    
+    def cover_weeks(self, start: date, end: date) -> List[tuple]:
+        pieces = []
+        day = start
+        while day <= end:
+            if day.weekday() == 0 and day + timedelta(days=6) <= end:
+                pieces.append(('week', self.week_key(day)))
+                day += timedelta(days=7)
+            else:
+                pieces.append(('day', self.day_key(day)))
+                day += timedelta(days=1)
+        return pieces
+    
+    def totals(self, start: date, end: date) -> Dict:
+        """Hours, sessions and distinct topics for the days start..end, inclusive"""
+        hours, sessions, topics, rows = 0.0, 0, set(), 0
+        for tier, key in self.cover(start, end):
+            bucket = self.tiers[tier].get(key)
+            if bucket is not None:
+                hours += bucket[0]
+                sessions += bucket[1]
+                topics |= bucket[2]
+                rows += 1
+        return {'hours': hours, 'sessions': sessions, 'distinct_topics': len(topics), 'rows_read': rows}
+
+class AnalyticsStore:
+    """Columnar day and session statistics behind the productivity and insight endpoints"""
+    
+    WEEKDAYS = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+    
+    def __init__(self):
+        # Day columns, dense from the earliest logged day (ordinal `base`)
+        self.base = None
+        self.day_hours = array('d')
+        self.day_sessions = array('l')
+        # Session columns, one entry per completed session
+        self.session_day = array('l')  # date ordinal of the start time
+        self.session_hour = array('b')  # hour of day of the start time
+        self.session_duration = array('d')
+        self.hour_sessions = array('l', [0]) * 24
+        self.hour_hours = array('d', [0.0]) * 24
+    
+    @classmethod
+    def build(cls, daily_logs: Dict, session_columns) -> 'AnalyticsStore':
+        """Load the columns from the daily logs and (start epoch us, duration) pairs"""
+        store = cls()
+        days = [(date.fromisoformat(date_str).toordinal(), log) for date_str, log in daily_logs.items()]
+        if days:
+            store.base = min(ordinal for ordinal, _ in days)
+            span = max(ordinal for ordinal, _ in days) - store.base + 1
+            store.day_hours = array('d', [0.0]) * span
+            store.day_sessions = array('l', [0]) * span
+            for ordinal, log in days:
+                store.day_hours[ordinal - store.base] += log['hours']
+                store.day_sessions[ordinal - store.base] += log['sessions']
+        for start_us, duration in session_columns:
+            store.add_session(start_us, duration)
+        return store
+    
+    def add_day(self, ordinal: int, hours: float, sessions: int = 1):
+        """Count a logged session towards its day"""
+        if self.base is None:
+            self.base = ordinal
+        if ordinal < self.base:
+            # Backdated entry: grow the columns at the front
+            self.day_hours[:0] = array('d', [0.0]) * (self.base - ordinal)
+            self.day_sessions[:0] = array('l', [0]) * (self.base - ordinal)
+            self.base = ordinal
+        offset = ordinal - self.base
+        if offset >= len(self.day_hours):
+            self.day_hours.extend(array('d', [0.0]) * (offset - len(self.day_hours) + 1))
+            self.day_sessions.extend(array('l', [0]) * (offset - len(self.day_sessions) + 1))
+        self.day_hours[offset] += hours
+        self.day_sessions[offset] += sessions
+    
+    def add_session(self, start_us: int, duration: float):
+        hour = start_us % DAY_US // HOUR_US
+        self.session_day.append(EPOCH_ORDINAL + start_us // DAY_US)
+        self.session_hour.append(hour)
+        self.session_duration.append(duration)
+        self.hour_sessions[hour] += 1
+        self.hour_hours[hour] += duration
+    
+    def days_learned(self) -> int:
+        return len(self.day_sessions) - self.day_sessions.count(0)
+    
+    def best_day(self) -> Dict:
+        if not self.day_hours or max(self.day_hours) <= 0:
+            return {'date': None, 'hours': 0}
+        hours = max(self.day_hours)
+        return {'date': date.fromordinal(self.base + self.day_hours.index(hours)).isoformat(), 'hours': hours}
+    
+    def weekly_totals(self, until: date = None) -> List[Dict]:
+        """Hours per calendar week (Monday to Sunday) from the first logged week to `until`'s week"""
+        if self.base is None:
+            return []
+        last = len(self.day_hours) - 1
+        if until is not None:
+            last = max(last, until.toordinal() - self.base)
+        first_monday = self.base - date.fromordinal(self.base).weekday()
+        return [
+            {
+                'week_start': date.fromordinal(week_start).isoformat(),
+                'hours': sum(self.day_hours[max(week_start - self.base, 0):week_start - self.base + 7])
+            }
+            for week_start in range(first_monday, self.base + last + 1, 7)
+        ]
+    
+    @staticmethod
+    def velocity_trend(weekly_hours: List[float]) -> str:
+        """Compare the last two weeks against the weeks before them"""
+        if len(weekly_hours) < 2:
+            return 'stable'
+        recent_avg = sum(weekly_hours[-2:]) / 2
+        older_avg = sum(weekly_hours[:-2]) / len(weekly_hours[:-2]) if len(weekly_hours) > 2 else recent_avg
+        if recent_avg > older_avg * 1.1:
+            return 'increasing'
+        if recent_avg < older_avg * 0.9:
+            return 'decreasing'
+        return 'stable'
+    
+    def weekday_hours(self) -> Dict[str, float]:
+        """Total hours per day of the week, as strided sums over the day column"""
+        totals = {}
+        if self.base is None:
+            return {name: 0.0 for name in self.WEEKDAYS}
+        first_weekday = date.fromordinal(self.base).weekday()
+        for weekday, name in enumerate(self.WEEKDAYS):
+            totals[name] = sum(self.day_hours[(weekday - first_weekday) % 7::7])
+        return totals
+    
+    def most_productive_hour(self) -> Optional[int]:
+        if not self.session_hour:
+            return None
+        return self.hour_sessions.index(max(self.hour_sessions))
+
+class MemoryActiveSessionStore:
+    """In-progress sessions kept in this process only"""
+    
+    def __init__(self):
+        self._sessions = {}
+        self._lock = threading.Lock()
+    
+    def create(self, session: Dict):
+        with self._lock:
+            self._sessions[session['id']] = session
+    
+    def get(self, session_id: str) -> Dict:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            return dict(session) if session is not None else None
+    
+    def update(self, session_id: str, mutate) -> Any:
+        """Apply mutate(session) atomically; returns its result, or None if not found"""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return None
+            return mutate(session)
+    
+    def pop(self, session_id: str) -> Dict:
+        """Atomically remove and return a session, or None if not found"""
+        with self._lock:
+            return self._sessions.pop(session_id, None)
+    
+    def keys(self, user_id: str = None) -> List[str]:
+        with self._lock:
+            return [
+                session_id for session_id, session in self._sessions.items()
+                if user_id is None or session['user_id'] == user_id
+            ]
+
+
+class SQLiteActiveSessionStore:
+    """In-progress sessions shared by every worker process on this host"""
+    
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+    
+    @property
+    def conn(self) -> sqlite3.Connection:
+        # Connections must not be shared across fork(), so each process opens its own
+        if self._conn is None or self._pid != os.getpid():
+            self._conn = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False,
+                                         isolation_level=None)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS active_sessions (id TEXT PRIMARY KEY, data TEXT NOT NULL)'
+            )
+            self._pid = os.getpid()
+        return self._conn
+    
+    def create(self, session: Dict):
+        with self._lock:
+            self.conn.execute(
+                'INSERT INTO active_sessions (id, data) VALUES (?, ?)',
+                (session['id'], json.dumps(session))
+            )
+    
+    def get(self, session_id: str) -> Dict:
+        with self._lock:
+            row = self.conn.execute(
+                'SELECT data FROM active_sessions WHERE id = ?', (session_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+    
+    def update(self, session_id: str, mutate) -> Any:
+        """Apply mutate(session) atomically; returns its result, or None if not found"""
+        with self._lock:
+            conn = self.conn
+            # BEGIN IMMEDIATE takes the write lock so other processes cannot interleave
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                row = conn.execute(
+                    'SELECT data FROM active_sessions WHERE id = ?', (session_id,)
+                ).fetchone()
+                if row is None:
+                    conn.execute('COMMIT')
+                    return None
+                session = json.loads(row[0])
+                result = mutate(session)
+                conn.execute(
+                    'UPDATE active_sessions SET data = ? WHERE id = ?', (json.dumps(session), session_id)
+                )
+                conn.execute('COMMIT')
+                return result
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+    
+    def pop(self, session_id: str) -> Dict:
+        """Atomically remove and return a session, or None if not found"""
+        with self._lock:
+            conn = self.conn
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                row = conn.execute(
+                    'SELECT data FROM active_sessions WHERE id = ?', (session_id,)
+                ).fetchone()
+                if row is not None:
+                    conn.execute('DELETE FROM active_sessions WHERE id = ?', (session_id,))
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+        return json.loads(row[0]) if row else None
+    
+    def keys(self, user_id: str = None) -> List[str]:
+        with self._lock:
+            rows = self.conn.execute('SELECT id, data FROM active_sessions').fetchall()
+        return [
+            session_id for session_id, data in rows
+            if user_id is None or json.loads(data)['user_id'] == user_id
+        ]
+
+
+def create_active_session_store():
+    """Create the active-session store selected by ACTIVE_SESSION_BACKEND"""
+    if ACTIVE_SESSION_BACKEND == 'sqlite':
+        return SQLiteActiveSessionStore(ACTIVE_SESSIONS_FILE)
+    return MemoryActiveSessionStore()
+
+
 # Active sessions tracker
-active_sessions = {}
+active_sessions = create_active_session_store()
 
-class ProgressTracker:
+
+class SessionEventBus:
+    """Fan-out of live session events to Server-Sent Event subscribers in this process"""
+    
     def __init__(self):
-        self.load_data()
+        self._subscribers = {}  # session_id -> set of queue.Queue
+        self._lock = threading.Lock()
     
-    def load_data(self):
-        """Load all data from JSON files"""
-        self.progress_data = self.load_json_file(PROGRESS_FILE, self.get_default_progress())
-        self.sessions_data = self.load_json_file(SESSIONS_FILE, [])
-        self.goals_data = self.load_json_file(GOALS_FILE, {})
+    def subscribe(self, session_id: str) -> queue.Queue:
+        events = queue.Queue()
+        with self._lock:
+            self._subscribers.setdefault(session_id, set()).add(events)
+        return events
+    
+    def unsubscribe(self, session_id: str, events: queue.Queue):
+        with self._lock:
+            subscribers = self._subscribers.get(session_id)
+            if subscribers is not None:
+                subscribers.discard(events)
+                if not subscribers:
+                    del self._subscribers[session_id]
+    
+    def publish(self, session_id: str, event: str, data: Dict):
+        with self._lock:
+            subscribers = list(self._subscribers.get(session_id, ()))
+        for events in subscribers:
+            events.put((event, data))
+
+
+session_events = SessionEventBus()
+
+
+class MetricCounter:
+    """Prometheus counter, one value per label combination"""
+    
+    kind = 'counter'
+    
+    def __init__(self, name: str, help_text: str, labels: tuple = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self._values = {}
+        self._lock = threading.Lock()
+    
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(str(labels[label]) for label in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+    
+    def samples(self) -> List[tuple]:
+        with self._lock:
+            return [('', key, (), value) for key, value in sorted(self._values.items())]
+
+class Histogram:
+    """Prometheus histogram with fixed upper bounds, one series per label combination"""
+    
+    kind = 'histogram'
+    
+    def __init__(self, name: str, help_text: str, labels: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.buckets = tuple(sorted(buckets))
+        self._values = {}  # label values -> [per-bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+    
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels[label]) for label in self.labels)
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[i] += 1
+            series[-1] += value
+    
+    @contextlib.contextmanager
+    def time(self, **labels):
+        """Observe the duration of the with-block in seconds"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+    
+    def samples(self) -> List[tuple]:
+        with self._lock:
+            snapshot = [(key, list(series)) for key, series in sorted(self._values.items())]
+        samples = []
+        for key, series in snapshot:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), series):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(float(bound))
+                samples.append(('_bucket', key, (('le', le),), cumulative))
+            samples.append(('_sum', key, (), series[-1]))
+            samples.append(('_count', key, (), cumulative))
+        return samples
+
+class MetricsRegistry:
+    """In-process metrics rendered in the Prometheus text exposition format"""
+    
+    def __init__(self):
+        self.metrics = []
+    
+    def counter(self, name: str, help_text: str, labels: tuple = ()) -> MetricCounter:
+        metric = MetricCounter(name, help_text, labels)
+        self.metrics.append(metric)
+        return metric
+    
+    def histogram(self, name: str, help_text: str, labels: tuple = (), buckets: tuple = LATENCY_BUCKETS) -> Histogram:
+        metric = Histogram(name, help_text, labels, buckets)
+        self.metrics.append(metric)
+        return metric
+    
+    @staticmethod
+    def format_labels(pairs) -> str:
+        if not pairs:
+            return ''
+        escaped = (
+            f'{name}="' + value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"') + '"'
+            for name, value in pairs
+        )
+        return '{' + ','.join(escaped) + '}'
+    
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.append(f'# HELP {metric.name} {metric.help_text}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            for suffix, key, extra, value in metric.samples():
+                labels = self.format_labels(tuple(zip(metric.labels, key)) + extra)
+                lines.append(f'{metric.name}{suffix}{labels} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+metrics = MetricsRegistry()
+REQUEST_COUNT = metrics.counter(
+    'tracker_http_requests_total', 'HTTP requests by endpoint, method and status code',
+    ('endpoint', 'method', 'status'))
+REQUEST_ERRORS = metrics.counter(
+    'tracker_http_request_errors_total', 'HTTP requests that ended in a 5xx response',
+    ('endpoint', 'method'))
+REQUEST_LATENCY = metrics.histogram(
+    'tracker_http_request_duration_seconds', 'Time to produce the response (first byte for streams)',
+    ('endpoint', 'method'))
+REQUEST_SIZE = metrics.histogram(
+    'tracker_http_request_size_bytes', 'Request body size (Content-Length), e.g. bulk imports',
+    ('endpoint', 'method'), SIZE_BUCKETS)
+RESPONSE_SIZE = metrics.histogram(
+    'tracker_http_response_size_bytes', 'Response body size; streamed bodies are counted when they finish',
+    ('endpoint',), SIZE_BUCKETS)
+STAGE_LATENCY = metrics.histogram(
+    'tracker_stage_duration_seconds', 'Time spent in internal stages (loading, aggregation, persistence)',
+    ('stage',))
+WRITE_BYTES = metrics.counter(
+    'tracker_write_bytes_total', 'Bytes written to data files', ('file',))
+WRITE_LATENCY = metrics.histogram(
+    'tracker_write_duration_seconds', 'Atomic file write duration, including fsync', ('file',))
+WRITE_ERRORS = metrics.counter(
+    'tracker_write_errors_total', 'Failed data file writes (retried on the next flush)', ('file',))
+
+class SessionJournal:
+    """Append-only JSONL log of completed sessions (one JSON record per line)"""
+    
+    def __init__(self, path: str, legacy_path: str = None):
+        self.path = path
+        self.legacy_path = legacy_path
+    
+    def load(self) -> List[Dict]:
+        """Load sessions from the legacy sessions.json (if present) and the journal, repairing it if needed"""
+        sessions = []
+        needs_compact = False
+        
+        if self.legacy_path and os.path.exists(self.legacy_path):
+            try:
+                with open(self.legacy_path, 'r') as f:
+                    sessions.extend(json.load(f))
+                needs_compact = True
+            except Exception as e:
+                print(f"Error loading {self.legacy_path}: {e}")
+        
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r') as f:
+                    for line in f:
+                        if not line.endswith('\n'):
+                            # Torn tail from a crash mid-append
+                            needs_compact = True
+                        line = line.strip()
+                        if not line:
+                            continue
+                        try:
+                            sessions.append(json.loads(line))
+                        except ValueError:
+                            needs_compact = True
+            except Exception as e:
+                print(f"Error loading {self.path}: {e}")
+        
+        # Only torn lines, duplicates or a legacy file justify a rewrite; appends alone never do
+        if needs_compact or len({session.get('id') for session in sessions}) != len(sessions):
+            sessions = self.compact(sessions)
+        return sessions
+    
+    def position(self) -> Dict:
+        """Identity and length of the journal file, recorded in snapshots"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return {'inode': None, 'offset': 0}
+        return {'inode': stat.st_ino, 'offset': stat.st_size}
+    
+    def read_tail(self, position: Dict) -> Optional[List[Dict]]:
+        """Sessions appended after a recorded position, or None if the journal was rewritten since"""
+        if not position or (self.legacy_path and os.path.exists(self.legacy_path)):
+            return None
+        current = self.position()
+        if current['inode'] != position.get('inode') or current['offset'] < position.get('offset', 0):
+            return None
+        if current['offset'] == position['offset']:
+            return []
+        
+        sessions = []
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(position['offset'])
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        return None  # Torn tail; a full load repairs it
+                    if line.strip():
+                        sessions.append(json.loads(line))
+        except (OSError, ValueError) as e:
+            print(f"Error replaying {self.path}: {e}")
+            return None
+        return sessions
+    
+    def append(self, session: Dict):
+        """Append one session"""
+        self.append_many([session])
+    
+    def append_many(self, sessions: List[Dict]):
+        """Append sessions with as few write() calls as the OS allows"""
+        lines = ''.join(
+            json.dumps(session, default=str, separators=(',', ':')) + '\n' for session in sessions
+        )
+        data = lines.encode('utf-8')
+        # O_APPEND writes land at the end; a short write is continued until the payload is all out
+        with WRITE_LATENCY.time(file=os.path.basename(self.path)):
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                view = memoryview(data)
+                while view:
+                    view = view[os.write(fd, view):]
+            finally:
+                os.close(fd)
+        WRITE_BYTES.inc(len(data), file=os.path.basename(self.path))
+    
+    def compact(self, sessions: List[Dict]) -> List[Dict]:
+        """Rewrite the journal with one line per unique session id"""
+        seen = set()
+        unique = []
+        for session in sessions:
+            session_id = session.get('id')
+            if session_id in seen:
+                continue
+            seen.add(session_id)
+            unique.append(session)
+        
+        try:
+            with STAGE_LATENCY.time(stage='journal_compact'):
+                # The journal is the only copy of the history, so always fsync before replacing it
+                atomic_write(self.path, ''.join(
+                    json.dumps(session, default=str, separators=(',', ':')) + '\n' for session in unique
+                ), fsync=True)
+            
+            # The legacy file is now fully contained in the journal
+            if self.legacy_path and os.path.exists(self.legacy_path):
+                os.replace(self.legacy_path, self.legacy_path + '.migrated')
+        except Exception as e:
+            print(f"Error compacting {self.path}: {e}")
+        
+        return unique
+
+def atomic_write(filepath: str, text: str, fsync: bool = False):
+    """Write a file via a temp file and os.replace so readers never see a partial file"""
+    tmp_path = f'{filepath}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w') as f:
+        f.write(text)
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp_path, filepath)
+    if fsync and hasattr(os, 'O_DIRECTORY'):
+        # Persist the rename itself
+        dir_fd = os.open(os.path.dirname(filepath) or '.', os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+class WriteBehindWriter:
+    """Coalesces file writes and flushes them from a background thread"""
+    
+    def __init__(self, interval: float = FLUSH_INTERVAL, max_pending: int = FLUSH_MAX_PENDING,
+                 fsync: bool = FSYNC_POLICY == 'always'):
+        self.interval = interval
+        self.max_pending = max_pending
+        self.fsync = fsync
+        self._seq = 0
+        self._pending = {}  # filepath -> (seq, render() returning the file contents)
+        self._pending_count = 0
+        self._in_flight = 0
+        self._written = {}  # filepath -> seq of the last write, so stale renders never win
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._wake = threading.Event()
+        self._thread = None
+        self._closed = False
+    
+    def schedule(self, filepath: str, render):
+        """Mark a file dirty; only the latest render for each file is written"""
+        with self._lock:
+            self._seq += 1
+            self._pending[filepath] = (self._seq, render)
+            self._pending_count += 1
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(target=self._run, name='write-behind', daemon=True)
+                self._thread.start()
+            if self._pending_count >= self.max_pending:
+                self._wake.set()
+        
+        if self._closed:
+            # After shutdown there is no flusher thread, so write through
+            self.flush()
+    
+    def flush(self, wait: bool = False):
+        """Write every dirty file now
+        
+        render() may take a tracker lock, so no writer lock is held while rendering.
+        With wait=True this also waits for flushes running on other threads; only
+        use that when the caller holds no tracker lock.
+        """
+        with self._lock:
+            pending = self._pending
+            self._pending = {}
+            self._pending_count = 0
+            self._in_flight += 1
+        
+        try:
+            for filepath, (seq, render) in pending.items():
+                filename = os.path.basename(filepath)
+                try:
+                    with STAGE_LATENCY.time(stage='save_render'):
+                        text = render()
+                    with self._write_lock:
+                        if seq > self._written.get(filepath, 0):
+                            with WRITE_LATENCY.time(file=filename):
+                                atomic_write(filepath, text, self.fsync)
+                            WRITE_BYTES.inc(len(text.encode('utf-8')), file=filename)
+                            self._written[filepath] = seq
+                except Exception as e:
+                    print(f"Error saving {filepath}: {e}")
+                    WRITE_ERRORS.inc(file=filename)
+                    with self._lock:
+                        self._pending.setdefault(filepath, (seq, render))
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+                self._idle.notify_all()
+                if wait:
+                    self._idle.wait_for(lambda: self._in_flight == 0)
+    
+    def close(self):
+        """Stop the flusher thread and write everything still pending"""
+        self._closed = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self.flush(wait=True)
+    
+    def _run(self):
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self.flush()
+            if self._closed:
+                return
+
+
+persistence = WriteBehindWriter()
+atexit.register(persistence.close)
+
+
+class JSONStorage:
+    """Storage engine backed by progress.json, goals.json and the session journal"""
+    
+    # Queries scan the in-memory history, so trackers answer them from their session index
+    indexed = False
+    
+    def __init__(self, data_dir: str = DATA_DIR, lock=None, writer: WriteBehindWriter = None):
+        # Held while serialising data, so writes never capture a half-applied mutation
+        self.lock = lock or threading.RLock()
+        self.writer = writer or persistence
+        self.progress_file = os.path.join(data_dir, 'progress.json')
+        self.goals_file = os.path.join(data_dir, 'goals.json')
+        self.sessions_journal = SessionJournal(
+            os.path.join(data_dir, 'sessions.jsonl'),
+            legacy_path=os.path.join(data_dir, 'sessions.json')
+        )
+        self._sessions = None  # Session history, read from the journal on first use
+        self.snapshot = None
+    
+    @property
+    def sessions(self) -> List[SessionRecord]:
+        with self.lock:
+            if self._sessions is None:
+                with STAGE_LATENCY.time(stage='load_sessions'):
+                    self._sessions = [SessionRecord.from_dict(session) for session in self.sessions_journal.load()]
+            return self._sessions
     
     def load_json_file(self, filepath: str, default: Any) -> Any:
         """Load JSON file with default fallback"""
@@ -229,12 +1555,875 @@ class ProgressTracker:
         return default
     
     def save_json_file(self, filepath: str, data: Any):
-        """Save data to JSON file"""
-        try:
-            with open(filepath, 'w') as f:
-                json.dump(data, f, indent=2, default=str)
-        except Exception as e:
-            print(f"Error saving {filepath}: {e}")
+        """Schedule an atomic rewrite of a JSON file on the write-behind thread"""
+        def render():
+            with self.lock:
+                return json.dumps(data, indent=2, default=str)
+        self.writer.schedule(filepath, render)
+    
+    def flush(self):
+        """Write pending changes to disk now (call without holding the lock)"""
+        self.writer.flush(wait=True)
+    
+    def load_progress(self, default: Dict) -> Dict:
+        progress_data = self.load_json_file(self.progress_file, default)
+        if isinstance(progress_data, dict):
+            self.snapshot = progress_data.pop('_snapshot', None)
+        return progress_data
+    
+    def save_progress(self, progress_data: Dict, snapshot=None):
+        """Schedule a progress.json rewrite; snapshot() adds derived state tied to the journal position"""
+        def render():
+            with self.lock:
+                document = progress_data
+                if snapshot is not None:
+                    state = dict(snapshot(), journal=self.sessions_journal.position())
+                    document = dict(progress_data, _snapshot=state)
+                return json.dumps(document, indent=2, default=str)
+        self.writer.schedule(self.progress_file, render)
+    
+    def save_snapshot(self, progress_data: Dict, snapshot):
+        """The snapshot lives in progress.json, so schedule a rewrite"""
+        self.save_progress(progress_data, snapshot)
+    
+    def load_snapshot(self) -> Optional[tuple]:
+        """(derived state, sessions journaled after it) from progress.json, if still valid"""
+        if not self.snapshot:
+            return None
+        tail = self.sessions_journal.read_tail(self.snapshot.get('journal'))
+        if tail is None:
+            return None
+        return self.snapshot, tail
+    
+    def save_daily_log(self, date_str: str, log: Dict):
+        """Daily logs are part of progress.json, written by save_progress"""
+        pass
+    
+    def load_goals(self) -> Dict:
+        return self.load_json_file(self.goals_file, {})
+    
+    def save_goals(self, goals_data: Dict):
+        self.save_json_file(self.goals_file, goals_data)
+    
+    def load_sessions(self) -> List[SessionRecord]:
+        return self.sessions
+    
+    def append_session(self, session: SessionRecord):
+        """Journal a session, adding it to the history if that is loaded"""
+        self.append_sessions([session])
+    
+    def append_sessions(self, sessions: List[SessionRecord]):
+        """Journal several sessions with one write"""
+        with self.lock:
+            self.sessions_journal.append_many([session.to_dict() for session in sessions])
+            if self._sessions is not None:
+                self._sessions.extend(sessions)
+    
+    def save_daily_logs(self, daily_logs: Dict):
+        """Daily logs are part of progress.json, written by save_progress"""
+        pass
+    
+    def changed_elsewhere(self) -> bool:
+        """One process owns a JSON data directory (see claim_data_dir)"""
+        return False
+    
+    def write_lock(self):
+        return contextlib.nullcontext()
+    
+    def reset(self):
+        """Delete all sessions and goals; the caller saves fresh progress afterwards"""
+        with self.lock:
+            self._sessions = self.sessions_journal.compact([])
+        # Overwrite rather than delete, so an in-flight flush cannot resurrect old data
+        self.save_goals({})
+    
+    def _matching(self, start: str = None, end: str = None, user_id: str = None):
+        """Records with start <= start_time < end, from a snapshot of the loaded history"""
+        start_us = to_epoch_us(start) if start is not None else None
+        end_us = to_epoch_us(end) if end is not None else None
+        # Stop at the sessions that existed when iteration began
+        for session in itertools.islice(self.sessions, len(self.sessions)):
+            if ((start_us is None or session.start >= start_us)
+                    and (end_us is None or session.start < end_us)
+                    and (user_id is None or session.user_id == user_id)):
+                yield session
+    
+    def iter_sessions(self, start: str = None, end: str = None, user_id: str = None):
+        """Lazily yield sessions with start <= start_time < end"""
+        for session in self._matching(start, end, user_id):
+            yield session.to_dict()
+    
+    def session_day_totals(self) -> Dict[str, tuple]:
+        """(hours, sessions) for each start date"""
+        totals = {}
+        for session in self.sessions:
+            day = session.start // DAY_US
+            hours, count = totals.get(day, (0.0, 0))
+            totals[day] = (hours + session.duration, count + 1)
+        return {
+            date.fromordinal(EPOCH_ORDINAL + day).isoformat(): day_totals for day, day_totals in totals.items()
+        }
+    
+    def session_columns(self):
+        """(start epoch microseconds, duration) for every session"""
+        return [(session.start, session.duration) for session in self.sessions]
+
+
+class SQLiteStorage:
+    """Storage engine backed by a single SQLite database in WAL mode"""
+    
+    # Recency queries read the (user_id, start_time) index without loading the history
+    indexed = True
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS progress (
+            user_id TEXT PRIMARY KEY,
+            data TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS sessions (
+            id TEXT PRIMARY KEY,
+            user_id TEXT NOT NULL,
+            start_time TEXT NOT NULL,
+            end_time TEXT,
+            duration REAL NOT NULL DEFAULT 0,
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_sessions_user_start ON sessions (user_id, start_time);
+        CREATE INDEX IF NOT EXISTS idx_sessions_start ON sessions (start_time);
+        CREATE TABLE IF NOT EXISTS daily_logs (
+            user_id TEXT NOT NULL,
+            date TEXT NOT NULL,
+            hours REAL NOT NULL DEFAULT 0,
+            sessions INTEGER NOT NULL DEFAULT 0,
+            topics TEXT NOT NULL DEFAULT '[]',
+            notes TEXT NOT NULL DEFAULT '[]',
+            PRIMARY KEY (user_id, date)
+        );
+        CREATE TABLE IF NOT EXISTS completions (
+            user_id TEXT NOT NULL,
+            stage_id TEXT NOT NULL,
+            kind TEXT NOT NULL,
+            item_index INTEGER NOT NULL,
+            PRIMARY KEY (user_id, stage_id, kind, item_index)
+        );
+        CREATE TABLE IF NOT EXISTS goals (
+            user_id TEXT NOT NULL,
+            name TEXT NOT NULL,
+            value TEXT NOT NULL,
+            PRIMARY KEY (user_id, name)
+        );
+        CREATE TABLE IF NOT EXISTS versions (
+            user_id TEXT PRIMARY KEY,
+            version INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS snapshots (
+            user_id TEXT PRIMARY KEY,
+            version INTEGER NOT NULL,
+            data TEXT NOT NULL
+        );
+    """
+    
+    # progress_data keys that live in their own tables
+    COMPLETION_KINDS = {'completed_topics': 'topic', 'completed_projects': 'project'}
+    
+    def __init__(self, db_path: str = SQLITE_FILE, user_id: str = DEFAULT_USER):
+        self.db_path = db_path
+        self.user_id = user_id
+        self._lock = threading.RLock()
+        self._sessions = None  # Full history, cached once something needs it
+        self.seen_version = None  # Data version this process last loaded or wrote
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(self.SCHEMA)
+    
+    def is_empty(self) -> bool:
+        with self._lock:
+            for table in ('progress', 'sessions', 'goals'):
+                if self.conn.execute(f'SELECT 1 FROM {table} LIMIT 1').fetchone():
+                    return False
+        return True
+    
+    def version(self) -> int:
+        """Counter bumped by every write to this user's data, from any process"""
+        with self._lock:
+            row = self.conn.execute('SELECT version FROM versions WHERE user_id = ?', (self.user_id,)).fetchone()
+        return row['version'] if row else 0
+    
+    def _bump_version(self):
+        """Count a write (inside its transaction); a gap means another process wrote in between"""
+        self.conn.execute(
+            'INSERT INTO versions (user_id, version) VALUES (?, 1) '
+            'ON CONFLICT(user_id) DO UPDATE SET version = version + 1', (self.user_id,)
+        )
+        version = self.conn.execute('SELECT version FROM versions WHERE user_id = ?', (self.user_id,)).fetchone()[0]
+        if self.seen_version is not None and version == self.seen_version + 1:
+            self.seen_version = version
+    
+    def changed_elsewhere(self) -> bool:
+        """Whether another process wrote this user's data since it was loaded here"""
+        return self.version() != self.seen_version
+    
+    def write_lock(self):
+        """This user's cross-process write lock"""
+        return user_write_lock(self.db_path + '.lock', self.user_id)
+    
+    def load_progress(self, default: Dict) -> Dict:
+        with self._lock:
+            # Read the version first: a write that lands mid-load makes it stale, so the next check reloads
+            self.seen_version = self.version()
+            self._sessions = None
+            row = self.conn.execute(
+                'SELECT data FROM progress WHERE user_id = ?', (self.user_id,)
+            ).fetchone()
+            if row is None:
+                return default
+            progress_data = json.loads(row['data'])
+            
+            progress_data['daily_logs'] = {
+                log['date']: {
+                    'hours': log['hours'],
+                    'sessions': log['sessions'],
+                    'topics': json.loads(log['topics']),
+                    'notes': json.loads(log['notes'])
+                }
+                for log in self.conn.execute(
+                    'SELECT * FROM daily_logs WHERE user_id = ? ORDER BY date', (self.user_id,)
+                )
+            }
+            
+            for key in self.COMPLETION_KINDS:
+                progress_data[key] = {}
+            kind_keys = {kind: key for key, kind in self.COMPLETION_KINDS.items()}
+            for row in self.conn.execute(
+                'SELECT stage_id, kind, item_index FROM completions WHERE user_id = ? ORDER BY rowid',
+                (self.user_id,)
+            ):
+                progress_data[kind_keys[row['kind']]].setdefault(row['stage_id'], []).append(row['item_index'])
+        return progress_data
+    
+    def load_snapshot(self) -> Optional[tuple]:
+        """(derived state, []) if the stored snapshot was written with the current data"""
+        with self._lock:
+            row = self.conn.execute(
+                'SELECT version, data FROM snapshots WHERE user_id = ?', (self.user_id,)
+            ).fetchone()
+        if row is None or row['version'] != self.seen_version:
+            return None
+        return json.loads(row['data']), []
+    
+    def save_progress(self, progress_data: Dict, snapshot=None):
+        """Save scalar progress fields and completions; daily logs go through save_daily_log"""
+        scalars = {
+            key: value for key, value in progress_data.items()
+            if key != 'daily_logs' and key not in self.COMPLETION_KINDS
+        }
+        completions = [
+            (self.user_id, stage_id, kind, item_index)
+            for key, kind in self.COMPLETION_KINDS.items()
+            for stage_id, indices in progress_data.get(key, {}).items()
+            for item_index in indices
+        ]
+        with self._lock, self.conn:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO progress (user_id, data) VALUES (?, ?)',
+                (self.user_id, json.dumps(scalars, default=str))
+            )
+            self.conn.execute('DELETE FROM completions WHERE user_id = ?', (self.user_id,))
+            self.conn.executemany(
+                'INSERT OR IGNORE INTO completions (user_id, stage_id, kind, item_index) VALUES (?, ?, ?, ?)',
+                completions
+            )
+            self._bump_version()
+            if snapshot is not None:
+                # Valid only at this version; any later write without a save makes it stale
+                self.conn.execute(
+                    'INSERT OR REPLACE INTO snapshots (user_id, version, data) '
+                    'SELECT user_id, version, ? FROM versions WHERE user_id = ?',
+                    (json.dumps(snapshot(), separators=(',', ':')), self.user_id)
+                )
+    
+    def save_snapshot(self, progress_data: Dict, snapshot):
+        """Replace the snapshot without a version bump, unless another process wrote since our load"""
+        with self._lock, self.conn:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO snapshots (user_id, version, data) '
+                'SELECT user_id, version, ? FROM versions WHERE user_id = ? AND version = ?',
+                (json.dumps(snapshot(), separators=(',', ':')), self.user_id, self.seen_version)
+            )
+    
+    def flush(self):
+        """Every write is already committed"""
+        pass
+    
+    def save_daily_log(self, date_str: str, log: Dict):
+        self.save_daily_logs({date_str: log})
+    
+    def save_daily_logs(self, daily_logs: Dict):
+        with self._lock, self.conn:
+            for date_str, log in daily_logs.items():
+                self._write_daily_log(date_str, log)
+            self._bump_version()
+    
+    def _write_daily_log(self, date_str: str, log: Dict):
+        self.conn.execute(
+            'INSERT OR REPLACE INTO daily_logs (user_id, date, hours, sessions, topics, notes) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            (self.user_id, date_str, log['hours'], log['sessions'],
+             json.dumps(log['topics']), json.dumps(log['notes']))
+        )
+    
+    def load_goals(self) -> Dict:
+        with self._lock:
+            return {
+                row['name']: json.loads(row['value'])
+                for row in self.conn.execute(
+                    'SELECT name, value FROM goals WHERE user_id = ?', (self.user_id,)
+                )
+            }
+    
+    def save_goals(self, goals_data: Dict):
+        with self._lock, self.conn:
+            self.conn.execute('DELETE FROM goals WHERE user_id = ?', (self.user_id,))
+            self.conn.executemany(
+                'INSERT INTO goals (user_id, name, value) VALUES (?, ?, ?)',
+                [(self.user_id, name, json.dumps(value, default=str)) for name, value in goals_data.items()]
+            )
+            self._bump_version()
+    
+    def load_sessions(self) -> List[SessionRecord]:
+        """Full session history, queried once and then kept in step with appends"""
+        with self._lock:
+            if self._sessions is None:
+                self._sessions = [
+                    SessionRecord.from_dict(session) for session in self.iter_sessions(user_id=self.user_id)
+                ]
+            return self._sessions
+    
+    def append_session(self, session: SessionRecord):
+        self.append_sessions([session])
+    
+    def append_sessions(self, sessions: List[SessionRecord]):
+        """Insert several sessions in one transaction"""
+        with self._lock, self.conn:
+            for session in sessions:
+                self._write_session(session.to_dict())
+            self._bump_version()
+            if self._sessions is not None:
+                self._sessions.extend(sessions)
+    
+    def _write_session(self, session: Dict):
+        self.conn.execute(
+            'INSERT OR REPLACE INTO sessions (id, user_id, start_time, end_time, duration, data) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            (session['id'], session.get('user_id', self.user_id), session['start_time'],
+             session.get('end_time'), session.get('duration', 0), json.dumps(session, default=str))
+        )
+    
+    def reset(self):
+        """Delete all sessions, progress and goals for this user"""
+        with self._lock, self.conn:
+            for table in ('progress', 'sessions', 'daily_logs', 'completions', 'goals', 'snapshots'):
+                self.conn.execute(f'DELETE FROM {table} WHERE user_id = ?', (self.user_id,))
+            self._bump_version()
+            self._sessions = None
+    
+    def _range_clause(self, start: str, end: str, user_id: str):
+        # Queries never cross into another user's partition
+        clauses, params = ['user_id = ?'], [user_id or self.user_id]
+        if start is not None:
+            clauses.append('start_time >= ?')
+            params.append(start)
+        if end is not None:
+            clauses.append('start_time < ?')
+            params.append(end)
+        where = ' WHERE ' + ' AND '.join(clauses)
+        return where, params
+    
+    def iter_sessions(self, start: str = None, end: str = None, user_id: str = None,
+                      batch_size: int = 500):
+        """Lazily yield sessions with start <= start_time < end, one indexed batch at a time"""
+        where, params = self._range_clause(start, end, user_id)
+        last = None
+        while True:
+            if last is None:
+                query = f'SELECT id, start_time, data FROM sessions{where}'
+                query_params = params
+            else:
+                query = f'SELECT id, start_time, data FROM sessions{where} AND (start_time, id) > (?, ?)'
+                query_params = params + list(last)
+            with self._lock:
+                rows = self.conn.execute(
+                    query + ' ORDER BY start_time, id LIMIT ?', query_params + [batch_size]
+                ).fetchall()
+            for row in rows:
+                yield json.loads(row['data'])
+            if len(rows) < batch_size:
+                return
+            last = (rows[-1]['start_time'], rows[-1]['id'])
+    
+    def recent_sessions(self, limit: int) -> List[SessionRecord]:
+        """Newest sessions first, read backwards along the (user_id, start_time) index"""
+        with self._lock:
+            rows = self.conn.execute(
+                'SELECT data FROM sessions WHERE user_id = ? ORDER BY start_time DESC, id DESC LIMIT ?',
+                (self.user_id, limit)
+            ).fetchall()
+        return [SessionRecord.from_dict(json.loads(row['data'])) for row in rows]
+    
+    def session_day_totals(self) -> Dict[str, tuple]:
+        """(hours, sessions) for each start date"""
+        with self._lock:
+            return {
+                row['day']: (row['hours'], row['sessions'])
+                for row in self.conn.execute(
+                    'SELECT substr(start_time, 1, 10) AS day, SUM(duration) AS hours, COUNT(*) AS sessions '
+                    'FROM sessions WHERE user_id = ? GROUP BY day', (self.user_id,)
+                )
+            }
+    
+    def session_columns(self):
+        """(start epoch microseconds, duration) for every session, without decoding the JSON"""
+        with self._lock:
+            return [
+                (to_epoch_us(row['start_time']), row['duration'])
+                for row in self.conn.execute(
+                    'SELECT start_time, duration FROM sessions WHERE user_id = ?', (self.user_id,)
+                )
+            ]
+    
+    def import_all(self, progress_data: Dict, sessions: List[Dict], goals_data: Dict):
+        """Bulk-load a full data set in one transaction (used by the JSON migration)"""
+        with self._lock, self.conn:
+            for session in sessions:
+                self._write_session(session)
+            for date_str, log in (progress_data or {}).get('daily_logs', {}).items():
+                self._write_daily_log(date_str, log)
+            self._bump_version()
+        if progress_data:
+            self.save_progress(progress_data)
+        self.save_goals(goals_data)
+
+
+def migrate_json_to_sqlite(data_dir: str = DATA_DIR, db_path: str = SQLITE_FILE) -> bool:
+    """One-shot import of the JSON files into an empty SQLite database"""
+    json_storage = JSONStorage(data_dir)
+    if not (os.path.exists(json_storage.progress_file)
+            or os.path.exists(json_storage.sessions_journal.path)
+            or os.path.exists(json_storage.sessions_journal.legacy_path)):
+        return False
+    
+    sqlite_storage = SQLiteStorage(db_path)
+    if not sqlite_storage.is_empty():
+        print(f"Skipping migration: {db_path} already contains data")
+        return False
+    
+    progress_data = json_storage.load_progress(None)
+    sessions = json_storage.sessions_journal.load()
+    goals_data = json_storage.load_goals()
+    sqlite_storage.import_all(progress_data, sessions, goals_data)
+    print(f"Migrated {len(sessions)} sessions from {data_dir} into {db_path}")
+    return True
+
+
+def get_user_data_dir(user_id: str) -> str:
+    """Data partition for a user; the default user keeps the original data directory"""
+    if user_id == DEFAULT_USER:
+        return DATA_DIR
+    return os.path.join(USERS_DIR, user_id)
+
+# Trackers keep totals in memory, so one process serves a data directory (threads are fine)
+data_dir_lock = None  # (pid, fd) holding DATA_DIR/tracker.lock
+
+def claim_data_dir():
+    """Refuse to serve DATA_DIR if another process already does; its in-memory totals would be overwritten"""
+    global data_dir_lock
+    if STORAGE_BACKEND == 'sqlite' and ACTIVE_SESSION_BACKEND == 'sqlite':
+        return  # Workers share the database and reload when another one writes
+    if fcntl is None or (data_dir_lock and data_dir_lock[0] == os.getpid()):
+        return
+    fd = os.open(os.path.join(DATA_DIR, 'tracker.lock'), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(fd)
+        raise RuntimeError(
+            f'{DATA_DIR} is already served by another process; run a single worker process (threads are fine), '
+            'or set TRACKER_STORAGE=sqlite and TRACKER_ACTIVE_SESSIONS=sqlite to run several'
+        )
+    data_dir_lock = (os.getpid(), fd)
+
+write_lock_files = {}  # path -> (pid, fd); POSIX record locks belong to the process, so one descriptor each
+write_lock_files_lock = threading.Lock()
+
+@contextlib.contextmanager
+def user_write_lock(path: str, user_id: str):
+    """Exclusive lock on one byte of a lock file, chosen by user, held across processes"""
+    if fcntl is None:
+        yield
+        return
+    with write_lock_files_lock:
+        entry = write_lock_files.get(path)
+        if entry is None or entry[0] != os.getpid():
+            entry = write_lock_files[path] = (os.getpid(), os.open(path, os.O_RDWR | os.O_CREAT, 0o644))
+    # Within a process the tracker lock already serialises a user's writes
+    offset = zlib.crc32(user_id.encode('utf-8'))
+    fcntl.lockf(entry[1], fcntl.LOCK_EX, 1, offset)
+    try:
+        yield
+    finally:
+        fcntl.lockf(entry[1], fcntl.LOCK_UN, 1, offset)
+
+def create_storage(lock=None, user_id: str = DEFAULT_USER):
+    """Create the storage engine selected by STORAGE_BACKEND"""
+    claim_data_dir()
+    if STORAGE_BACKEND == 'sqlite':
+        if not os.path.exists(SQLITE_FILE):
+            migrate_json_to_sqlite()
+        return SQLiteStorage(SQLITE_FILE, user_id=user_id)
+    data_dir = get_user_data_dir(user_id)
+    os.makedirs(data_dir, exist_ok=True)
+    return JSONStorage(data_dir, lock=lock)
+
+def synchronized(method):
+    """Run a ProgressTracker method while holding the tracker lock"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+def synchronized_write(method):
+    """Like synchronized, but also hold the storage's cross-process write lock and start from its latest data"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.lock:
+            if self._writing:
+                return method(self, *args, **kwargs)
+            with self.storage.write_lock():
+                self._writing = True
+                try:
+                    if self.storage.changed_elsewhere():
+                        self.load_data()
+                        self.bump_version()
+                    return method(self, *args, **kwargs)
+                finally:
+                    self._writing = False
+    return wrapper
+
+
+class ProgressTracker:
+    def __init__(self, storage=None, user_id: str = DEFAULT_USER):
+        self.user_id = user_id
+        # All mutations (and reads of shared state) are serialised through this lock
+        self.lock = threading.RLock()
+        self.storage = storage or create_storage(self.lock, user_id)
+        # ETags must not repeat across restarts, so versions are scoped to this instance
+        self.instance_id = uuid.uuid4().hex[:12]
+        self.data_version = 0
+        self.payload_cache = {}
+        self._writing = False
+        # Under the write lock a load never sees another process's write half done
+        with self.storage.write_lock():
+            self.load_data()
+    
+    @property
+    def sessions_data(self) -> List[SessionRecord]:
+        """Full session history; the storage engine loads it on first use"""
+        return self.storage.load_sessions()
+    
+    @property
+    def session_index(self) -> SessionTimeIndex:
+        with self.lock:
+            if self._session_index is None:
+                self._session_index = SessionTimeIndex(self.sessions_data)
+            return self._session_index
+    
+    @property
+    def search_index(self) -> SearchIndex:
+        """Inverted index over notes and topics, built from the history on first search"""
+        with self.lock:
+            if self._search_index is None:
+                with STAGE_LATENCY.time(stage='build_search_index'):
+                    self._search_index = SearchIndex(self.sessions_data)
+            return self._search_index
+    
+    @property
+    def topic_index(self) -> TopicIndex:
+        """Per-topic totals, restored from the snapshot or built from the history on first use"""
+        with self.lock:
+            if self._topic_index is None:
+                with STAGE_LATENCY.time(stage='build_topic_index'):
+                    self._topic_index = TopicIndex.build(self.sessions_data)
+                self.save_snapshot()
+            return self._topic_index
+    
+    @property
+    def rollups(self) -> RollupStore:
+        """Day/week/month/stage rollups, restored from the snapshot or built from the history on first use"""
+        with self.lock:
+            if self._rollups is None:
+                with STAGE_LATENCY.time(stage='build_rollups'):
+                    self._rollups = RollupStore.build(self.sessions_data, self.get_session_stage)
+                self.save_snapshot()
+            return self._rollups
+    
+    @property
+    def analytics(self) -> AnalyticsStore:
+        """Columnar statistics, built on first use and then updated on every write"""
+        with self.lock:
+            if self._analytics is None:
+                with STAGE_LATENCY.time(stage='build_analytics'):
+                    self._analytics = AnalyticsStore.build(self.progress_data['daily_logs'],
+                                                           self.storage.session_columns())
+            return self._analytics
+    
+    @synchronized
+    def load_data(self):
+        """Load progress and goals, then restore derived state from the snapshot when possible"""
+        with STAGE_LATENCY.time(stage='load'):
+            self.progress_data = self.storage.load_progress(self.get_default_progress())
+            self.goals_data = self.storage.load_goals()
+            self._session_index = None  # Built from the history on first use
+            self._search_index = None
+            recovery = self.storage.load_snapshot()
+        
+        if recovery is None:
+            recounted = self.recount_progress()
+            self.rebuild_derived_state()
+            if recounted:
+                self.check_achievements()
+                self.save_progress()
+        else:
+            self.restore_snapshot(*recovery)
+    
+    def recount_progress(self) -> bool:
+        """Rebuild totals and daily logs from the session history if progress fell behind it"""
+        day_totals = self.storage.session_day_totals().values()
+        hours = sum(day_hours for day_hours, _ in day_totals)
+        sessions = sum(count for _, count in day_totals)
+        if (sessions == self.progress_data['total_sessions']
+                and abs(hours - self.progress_data['total_hours']) < 1e-6):
+            return False
+        
+        # Sessions were journaled but the progress write did not reach disk (crash during write-behind)
+        with STAGE_LATENCY.time(stage='recount_progress'):
+            daily_logs = {}
+            for session in self.sessions_data:
+                date_str = date.fromordinal(session.end_day_ordinal()).isoformat()
+                log = daily_logs.setdefault(date_str, {'hours': 0, 'sessions': 0, 'topics': [], 'notes': []})
+                log['hours'] += session.duration
+                log['sessions'] += 1
+                log['topics'].extend(topic for topic in session.topics if topic not in log['topics'])
+                if session.notes:
+                    log['notes'].append(session.notes)
+            
+            self.progress_data['total_hours'] = hours
+            self.progress_data['total_sessions'] = sessions
+            self.progress_data['daily_logs'] = daily_logs
+            self.storage.save_daily_logs(daily_logs)
+        return True
+    
+    @synchronized_write
+    def refresh(self):
+        """Reload if another worker process changed this user's data (SQLite storage)"""
+        pass  # synchronized_write reloads before running any write
+    
+    def rebuild_derived_state(self):
+        """Recompute every index and aggregate derived from the stored data"""
+        with STAGE_LATENCY.time(stage='rebuild_derived_state'):
+            self._analytics = None  # Rebuilt on first use
+            self._topic_index = None
+            self._rollups = None
+            self.rebuild_aggregates()
+            self.rebuild_streaks()
+    
+    def snapshot_state(self) -> Dict:
+        """Derived state saved alongside progress.json (rendered under the lock)"""
+        snapshot = {
+            'week_totals': {
+                str(week): [totals['hours'], totals['sessions']] for week, totals in self.week_totals.items()
+            },
+            'streak_runs': [self.streaks.run_starts, self.streaks.run_ends],
+            'longest_run': self.streaks.longest
+        }
+        if self._topic_index is not None:
+            snapshot['topics'] = self._topic_index.to_state()
+        if self._rollups is not None:
+            snapshot['rollups'] = self._rollups.to_state()
+        return snapshot
+    
+    def restore_snapshot(self, snapshot: Dict, tail: List[Dict]):
+        """Load derived state from a snapshot, then replay sessions journaled after it"""
+        with STAGE_LATENCY.time(stage='restore_snapshot'):
+            self._analytics = None
+            self.week_totals = {
+                int(week): {'hours': hours, 'sessions': sessions}
+                for week, (hours, sessions) in snapshot['week_totals'].items()
+            }
+            self.fold_stage_totals()
+            
+            self.streaks = StreakIndex()
+            self.streaks.run_starts, self.streaks.run_ends = (list(runs) for runs in snapshot['streak_runs'])
+            self.streaks.longest = snapshot['longest_run']
+            topics = snapshot.get('topics')
+            self._topic_index = TopicIndex.from_state(topics) if topics is not None else None
+            rollups = snapshot.get('rollups')
+            self._rollups = RollupStore.from_state(rollups) if rollups is not None else None
+            
+            # Sessions whose progress update may not have reached progress.json before a crash
+            for session in map(SessionRecord.from_dict, tail):
+                self.add_to_aggregates(session)
+                if self._topic_index is not None:
+                    self._topic_index.add(session)
+                if self._rollups is not None:
+                    self._rollups.add(session, self.get_session_stage(session))
+                self.progress_data['total_hours'] += session.duration
+                self.progress_data['total_sessions'] += 1
+                self.update_daily_log(date.fromordinal(session.end_day_ordinal()).isoformat(),
+                                      session.duration, list(session.topics), session.notes, persist=False)
+            self.update_streak()
+            if tail:
+                self.check_achievements()
+                self.save_progress()
+    
+    def save_progress(self):
+        """Persist progress data"""
+        with STAGE_LATENCY.time(stage='save_progress'):
+            self.storage.save_progress(self.progress_data, self.snapshot_state)
+    
+    def save_snapshot(self):
+        """Persist derived state built since the last write, so the next load restores it"""
+        with STAGE_LATENCY.time(stage='save_snapshot'):
+            self.storage.save_snapshot(self.progress_data, self.snapshot_state)
+    
+    def flush(self):
+        """Write any pending changes to disk (call without holding the lock)"""
+        self.storage.flush()
+    
+    def append_session(self, session: Dict):
+        """Record a completed session in memory and in storage"""
+        self.append_sessions([session])
+    
+    def append_sessions(self, sessions: List[Dict]):
+        """Record completed sessions in storage and in the derived state"""
+        records = [SessionRecord.from_dict(session) for session in sessions]
+        self.storage.append_sessions(records)
+        for session in records:
+            if self._session_index is not None:
+                self._session_index.add(session)
+            if self._search_index is not None:
+                self._search_index.add(session)
+            if self._analytics is not None:
+                self._analytics.add_session(session.start, session.duration)
+            if self._topic_index is not None:
+                self._topic_index.add(session)
+            if self._rollups is not None:
+                self._rollups.add(session, self.get_session_stage(session))
+            self.add_to_aggregates(session)
+    
+    def get_session_week(self, session: SessionRecord) -> int:
+        """Plan week in which a session started (week 1 starts on start_date)"""
+        return (session.day_ordinal() - PLAN_START.toordinal()) // 7 + 1
+    
+    def get_session_stage(self, session: SessionRecord) -> Optional[int]:
+        """Plan stage of the week a session started in (None outside the plan)"""
+        return WEEK_TO_STAGE.get(self.get_session_week(session))
+    
+    def rebuild_aggregates(self):
+        """Recompute per-stage and per-week counters from the session index or per-day totals"""
+        if self._session_index is not None:
+            self.week_totals = self.index_week_totals(self._session_index)
+            self.fold_stage_totals()
+            return
+        
+        # Bin every day by plan week into flat arrays, then fold weeks into stages
+        day_totals = self.storage.session_day_totals()
+        plan_start = PLAN_START.toordinal()
+        weeks = [(date.fromisoformat(day).toordinal() - plan_start) // 7 + 1 for day in day_totals]
+        first_week = min(weeks, default=1)
+        span = max(weeks, default=0) - first_week + 1
+        week_hours = array('d', [0.0]) * span
+        week_sessions = array('l', [0]) * span
+        for week, (hours, sessions) in zip(weeks, day_totals.values()):
+            week_hours[week - first_week] += hours
+            week_sessions[week - first_week] += sessions
+        
+        self.week_totals = {
+            first_week + i: {'hours': week_hours[i], 'sessions': week_sessions[i]}
+            for i in range(span) if week_sessions[i]
+        }
+        self.fold_stage_totals()
+    
+    def index_week_totals(self, index: SessionTimeIndex) -> Dict[int, Dict]:
+        """Per-week totals as range sums over the time index, one bisect per week boundary"""
+        if not index.starts:
+            return {}
+        plan_start = (PLAN_START.toordinal() - EPOCH_ORDINAL) * DAY_US
+        week = 7 * DAY_US
+        first_week = (index.starts[0] - plan_start) // week + 1
+        last_week = (index.starts[-1] - plan_start) // week + 1
+        boundaries = [plan_start + (number - 1) * week for number in range(first_week, last_week + 2)]
+        return {
+            number: {'hours': hours, 'sessions': sessions}
+            for number, (hours, sessions) in zip(range(first_week, last_week + 1), index.bucket_totals(boundaries))
+            if sessions
+        }
+    
+    def fold_stage_totals(self):
+        """Sum week totals into per-stage totals"""
+        self.stage_totals = {
+            stage_num: {'hours': 0.0, 'sessions': 0} for stage_num in LEARNING_PLAN['stages']
+        }
+        for week, totals in self.week_totals.items():
+            stage_num = WEEK_TO_STAGE.get(week)
+            if stage_num is not None:
+                self.stage_totals[stage_num]['hours'] += totals['hours']
+                self.stage_totals[stage_num]['sessions'] += totals['sessions']
+        
+        self._weekly_stats_cache = None
+    
+    def add_to_aggregates(self, session: SessionRecord):
+        """Count one session towards its week and stage totals"""
+        week = self.get_session_week(session)
+        duration = session.duration
+        
+        week_totals = self.week_totals.setdefault(week, {'hours': 0.0, 'sessions': 0})
+        week_totals['hours'] += duration
+        week_totals['sessions'] += 1
+        
+        stage_num = WEEK_TO_STAGE.get(week)
+        if stage_num is not None:
+            self.stage_totals[stage_num]['hours'] += duration
+            self.stage_totals[stage_num]['sessions'] += 1
+        
+        self._weekly_stats_cache = None
+    
+    def update_daily_log(self, date_str: str, duration: float, topics: List[str] = None, notes: str = '',
+                         persist: bool = True):
+        """Add a session's hours, topics and notes to the log for date_str"""
+        if date_str not in self.progress_data['daily_logs']:
+            self.progress_data['daily_logs'][date_str] = {
+                'hours': 0,
+                'sessions': 0,
+                'topics': [],
+                'notes': []
+            }
+        
+        log = self.progress_data['daily_logs'][date_str]
+        log['hours'] += duration
+        log['sessions'] += 1
+        if topics:
+            log['topics'].extend(topic for topic in dict.fromkeys(topics) if topic not in log['topics'])
+        if notes:
+            log['notes'].append(notes)
+        if self._analytics is not None:
+            self._analytics.add_day(date.fromisoformat(date_str).toordinal(), duration)
+        if log['hours'] > 0:
+            self.streaks.add_day(date.fromisoformat(date_str))
+        if persist:
+            self.storage.save_daily_log(date_str, log)
     
     def get_default_progress(self) -> Dict:
         """Get default progress data structure"""
@@ -260,6 +2449,18 @@ class ProgressTracker:
         days_diff = (current_date - start_date).days
         return max(1, min(48, (days_diff // 7) + 1))
     
+    def get_week_start(self, week: int) -> datetime:
+        """Midnight on the first day of a plan week (week 1 starts on start_date)"""
+        return PLAN_START + timedelta(weeks=week - 1)
+    
+    def get_stage_start(self, stage_num: int) -> date:
+        """First day of a plan stage"""
+        return self.get_week_start(min(LEARNING_PLAN['stages'][stage_num]['weeks'])).date()
+    
+    def get_stage_end(self, stage_num: int) -> date:
+        """Last day of a plan stage"""
+        return self.get_week_start(max(LEARNING_PLAN['stages'][stage_num]['weeks']) + 1).date() - timedelta(days=1)
+    
     def get_current_stage(self, week: int) -> int:
         """Determine current stage based on week"""
         for stage_num, stage_info in LEARNING_PLAN['stages'].items():
@@ -269,32 +2470,12 @@ class ProgressTracker:
     
     def calculate_expected_hours(self, week: int = None) -> float:
         """Calculate expected hours based on days elapsed since start date"""
-        start_date = datetime.strptime(LEARNING_PLAN['start_date'], '%Y-%m-%d')
-        current_date = datetime.now()
-        days_elapsed = max(0, (current_date - start_date).days)
-        
-        # If we haven't started yet (future start date), return 0
-        if days_elapsed < 0:
-            return 0.0
-        
-        # Calculate expected hours based on daily targets
-        total_expected = 0.0
-        
-        for day in range(days_elapsed + 1):  # Include today
-            day_date = start_date + timedelta(days=day)
-            day_of_week = day_date.weekday()  # 0=Monday, 6=Sunday
-            
-            # Weekend days (Saturday=5, Sunday=6) have different targets
-            if day_of_week >= 5:  # Weekend
-                daily_target = LEARNING_PLAN['weekend_target']
-            else:  # Weekday
-                daily_target = LEARNING_PLAN['weekday_target']
-            
-            total_expected += daily_target
+        total_expected = PLAN_CALENDAR.expected_hours(datetime.now().date())  # Includes today
         
         # Cap at total program hours
         return min(total_expected, LEARNING_PLAN['total_hours'])
     
+    @synchronized
     def get_progress_status(self) -> Dict:
         """Calculate detailed progress status"""
         current_week = self.get_current_week()
@@ -305,9 +2486,9 @@ class ProgressTracker:
         progress_ratio = actual_hours / expected_hours if expected_hours > 0 else 0
         
         # Calculate daily target for today
-        today = datetime.now().weekday()  # 0=Monday, 6=Sunday
-        is_weekend = today >= 5
-        daily_target = LEARNING_PLAN['weekend_target'] if is_weekend else LEARNING_PLAN['weekday_target']
+        today = datetime.now().date()
+        is_weekend = today.weekday() >= 5  # 0=Monday, 6=Sunday
+        daily_target = PLAN_CALENDAR.target_for(today)
         
         # Calculate catch-up requirements
         remaining_weeks = max(0, LEARNING_PLAN['total_weeks'] - current_week)
@@ -353,12 +2534,13 @@ class ProgressTracker:
             'is_weekend': is_weekend
         }
     
-    def start_session(self, user_id: str = 'default') -> str:
+    @synchronized
+    def start_session(self) -> str:
         """Start a new learning session"""
         session_id = str(uuid.uuid4())
         session_data = {
             'id': session_id,
-            'user_id': user_id,
+            'user_id': self.user_id,
             'start_time': datetime.now().isoformat(),
             'status': 'active',
             'paused_time': 0.0,
@@ -368,16 +2550,28 @@ class ProgressTracker:
             'difficulty': 3
         }
         
-        active_sessions[session_id] = session_data
+        active_sessions.create(session_data)
+        self.bump_version()
+        session_events.publish(session_id, 'start', {
+            'session_id': session_id,
+            'status': 'active',
+            'start_time': session_data['start_time']
+        })
         return session_id
     
+    @synchronized_write
     def end_session(self, session_id: str, notes: str = '', topics: List[str] = None, 
                    mood: str = '', difficulty: int = 3) -> Dict:
         """End a learning session and save data"""
-        if session_id not in active_sessions:
+        session = active_sessions.get(session_id)
+        if session is None or session['user_id'] != self.user_id:
+            return {'error': 'Session not found'}
+        
+        # Claim the session so no other worker can end it twice
+        session = active_sessions.pop(session_id)
+        if session is None:
             return {'error': 'Session not found'}
         
-        session = active_sessions[session_id]
         end_time = datetime.now()
         start_time = datetime.fromisoformat(session['start_time'])
         duration = (end_time - start_time).total_seconds() / 3600  # hours
@@ -393,9 +2587,12 @@ class ProgressTracker:
             'status': 'completed'
         })
         
-        # Save to sessions file
-        self.sessions_data.append(session)
-        self.save_json_file(SESSIONS_FILE, self.sessions_data)
+        # Save to session journal
+        try:
+            self.append_session(session)
+        except Exception:
+            active_sessions.create(session)
+            raise
         
         # Update progress data
         self.progress_data['total_hours'] += duration
@@ -404,72 +2601,79 @@ class ProgressTracker:
         
         # Update daily log
         today = datetime.now().date().isoformat()
-        if today not in self.progress_data['daily_logs']:
-            self.progress_data['daily_logs'][today] = {
-                'hours': 0,
-                'sessions': 0,
-                'topics': [],
-                'notes': []
-            }
-        
-        self.progress_data['daily_logs'][today]['hours'] += duration
-        self.progress_data['daily_logs'][today]['sessions'] += 1
-        if topics:
-            self.progress_data['daily_logs'][today]['topics'].extend(topics)
-        if notes:
-            self.progress_data['daily_logs'][today]['notes'].append(notes)
+        self.update_daily_log(today, duration, topics, notes)
         
         # Update streak
         self.update_streak()
         
         # Check achievements
-        self.check_achievements()
+        new_achievements = self.check_achievements()
         
         # Save progress data
-        self.save_json_file(PROGRESS_FILE, self.progress_data)
+        self.save_progress()
         
-        # Remove from active sessions
-        del active_sessions[session_id]
+        self.bump_version()
+        
+        # Achievements first, so live streams see them before the stream closes
+        for achievement in new_achievements:
+            session_events.publish(session_id, 'achievement', achievement)
+        session_events.publish(session_id, 'end', {
+            'session_id': session_id,
+            'status': 'completed',
+            'duration': duration,
+            'end_time': session['end_time']
+        })
         
         return {
             'success': True,
             'session': session,
-            'new_achievements': self.get_recent_achievements()
+            'new_achievements': new_achievements
         }
     
+    @synchronized
     def pause_session(self, session_id: str) -> Dict:
         """Pause an active session"""
-        if session_id not in active_sessions:
-            return {'error': 'Session not found'}
+        def pause(session):
+            if session['user_id'] != self.user_id:
+                return None
+            if 'pause_start' not in session:
+                session['pause_start'] = datetime.now().isoformat()
+                return {'success': True, 'message': 'Session paused'}
+            else:
+                return {'error': 'Session already paused'}
         
-        session = active_sessions[session_id]
-        if 'pause_start' not in session:
-            session['pause_start'] = datetime.now().isoformat()
-            return {'success': True, 'message': 'Session paused'}
-        else:
-            return {'error': 'Session already paused'}
+        result = active_sessions.update(session_id, pause) or {'error': 'Session not found'}
+        if result.get('success'):
+            session_events.publish(session_id, 'pause', self.get_session_status(session_id))
+        return result
     
+    @synchronized
     def resume_session(self, session_id: str) -> Dict:
         """Resume a paused session"""
-        if session_id not in active_sessions:
-            return {'error': 'Session not found'}
+        def resume(session):
+            if session['user_id'] != self.user_id:
+                return None
+            if 'pause_start' in session:
+                pause_start = datetime.fromisoformat(session['pause_start'])
+                pause_duration = (datetime.now() - pause_start).total_seconds() / 3600
+                session['paused_time'] += pause_duration
+                del session['pause_start']
+                return {'success': True, 'message': 'Session resumed'}
+            else:
+                return {'error': 'Session not paused'}
         
-        session = active_sessions[session_id]
-        if 'pause_start' in session:
-            pause_start = datetime.fromisoformat(session['pause_start'])
-            pause_duration = (datetime.now() - pause_start).total_seconds() / 3600
-            session['paused_time'] += pause_duration
-            del session['pause_start']
-            return {'success': True, 'message': 'Session resumed'}
-        else:
-            return {'error': 'Session not paused'}
+        result = active_sessions.update(session_id, resume) or {'error': 'Session not found'}
+        if result.get('success'):
+            session_events.publish(session_id, 'resume', self.get_session_status(session_id))
+        return result
     
+    @synchronized
     def get_session_status(self, session_id: str) -> Dict:
         """Get current session status and duration"""
-        if session_id not in active_sessions:
+        session = active_sessions.get(session_id)
+        if session is None or session['user_id'] != self.user_id:
             return {'error': 'Session not found'}
         
-        session = active_sessions[session_id]
         start_time = datetime.fromisoformat(session['start_time'])
         current_time = datetime.now()
         
@@ -493,42 +2697,32 @@ class ProgressTracker:
             'paused_time': session['paused_time']
         }
     
+    def rebuild_streaks(self):
+        """Rebuild the streak index from the daily logs"""
+        self.streaks = StreakIndex()
+        for date_str in sorted(self.progress_data['daily_logs']):
+            if self.progress_data['daily_logs'][date_str]['hours'] > 0:
+                self.streaks.add_day(date.fromisoformat(date_str))
+        self.update_streak()
+    
     def update_streak(self):
-        """Update learning streak based on daily logs"""
-        dates = sorted(self.progress_data['daily_logs'].keys())
-        if not dates:
-            self.progress_data['current_streak'] = 0
-            return
-        
-        # Check if logged today or yesterday
-        today = datetime.now().date()
-        yesterday = today - timedelta(days=1)
-        
-        today_str = today.isoformat()
-        yesterday_str = yesterday.isoformat()
-        
-        if today_str not in dates and yesterday_str not in dates:
-            self.progress_data['current_streak'] = 0
-            return
-        
-        # Calculate current streak
-        current_streak = 0
-        check_date = today
-        
-        while True:
-            date_str = check_date.isoformat()
-            if date_str in dates and self.progress_data['daily_logs'][date_str]['hours'] > 0:
-                current_streak += 1
-                check_date -= timedelta(days=1)
-            else:
-                break
-        
-        self.progress_data['current_streak'] = current_streak
+        """Update current and longest streak from the streak index"""
+        self.progress_data['current_streak'] = self.streaks.current(datetime.now().date())
         self.progress_data['longest_streak'] = max(
-            self.progress_data.get('longest_streak', 0), 
-            current_streak
+            self.progress_data.get('longest_streak', 0),
+            self.streaks.longest
         )
     
+    @synchronized
+    def get_streak_history(self, min_days: int = 1) -> Dict:
+        """Current and longest streak plus every historical streak interval"""
+        self.update_streak()
+        return {
+            'current_streak': self.progress_data['current_streak'],
+            'longest_streak': self.progress_data['longest_streak'],
+            'streaks': self.streaks.intervals(min_days)
+        }
+    
     def check_achievements(self):
         """Check and award new achievements"""
         new_achievements = []
@@ -582,62 +2776,210 @@ class ProgressTracker:
         
         return new_achievements
     
-    def get_recent_achievements(self) -> List[Dict]:
-        """Get recently earned achievements"""
-        # This would normally track recent achievements
-        # For now, return empty list
-        return []
+    @synchronized
+    def get_dashboard_data(self) -> Dict:
+        """Get comprehensive dashboard data"""
+        status = self.get_progress_status()
+        
+        # Calculate stage progress
+        stage_progress = {
+            stage_num: self.get_stage_progress(stage_num, status['current_week'])
+            for stage_num in LEARNING_PLAN['stages']
+        }
+        
+        # Get recent sessions; SQLite answers without the history, which the index needs
+        if self.storage.indexed and self._session_index is None:
+            recent = self.storage.recent_sessions(10)
+        else:
+            recent = self.session_index.recent(10)
+        recent_sessions = [session.to_dict() for session in recent]
+        
+        # Get weekly stats
+        weekly_stats = self.get_weekly_stats()
+        
+        return {
+            'status': status,
+            'progress_data': self.progress_data,
+            'stage_progress': stage_progress,
+            'recent_sessions': recent_sessions,
+            'weekly_stats': weekly_stats,
+            'active_sessions': active_sessions.keys(self.user_id),
+            'total_achievements': len(self.progress_data['achievements'])
+        }
+    
+    @synchronized
+    def list_sessions(self, limit: int = SESSION_PAGE_SIZE, cursor: str = None,
+                      start: str = None, end: str = None) -> Dict:
+        """Newest-first page of completed sessions, continued with the returned cursor"""
+        before = None
+        if cursor:
+            try:
+                before = tuple(json.loads(base64.urlsafe_b64decode(cursor.encode('ascii'))))
+            except (ValueError, TypeError) as e:
+                raise ValueError(f'Invalid cursor: {cursor}') from e
+            if len(before) != 2 or not isinstance(before[0], int) or not isinstance(before[1], str):
+                raise ValueError(f'Invalid cursor: {cursor}')
+        
+        sessions, next_key = self.session_index.page(limit, before, start, end)
+        next_cursor = None
+        if next_key is not None:
+            next_cursor = base64.urlsafe_b64encode(json.dumps(next_key).encode('utf-8')).decode('ascii')
+        
+        return {
+            'sessions': [session.to_dict() for session in sessions],
+            'next_cursor': next_cursor,
+            'limit': limit
+        }
+    
+    @synchronized
+    def get_sessions_in_range(self, start: str = None, end: str = None, topic: str = None) -> Dict:
+        """Sessions starting in [start, end), oldest first, optionally tagged with a topic"""
+        index = self.session_index
+        if topic:
+            wanted = topic.casefold()
+            sessions = [
+                session for session in index.range(start, end)
+                if any(tag.casefold() == wanted for tag in session.topics)
+            ]
+            totals = {'hours': sum(session.duration for session in sessions), 'sessions': len(sessions)}
+        else:
+            sessions = index.range(start, end)
+            totals = index.totals(start, end)
+        
+        return {
+            'from': start,
+            'to': end,
+            'topic': topic,
+            'total_hours': totals['hours'],
+            'total_sessions': totals['sessions'],
+            'sessions': [session.to_dict() for session in sessions]
+        }
+    
+    @synchronized
+    def search_sessions(self, query: str, start: str = None, end: str = None,
+                        limit: int = SESSION_PAGE_SIZE) -> Dict:
+        """Sessions whose notes or topics contain every word and "quoted phrase", best match first"""
+        terms, phrases = SearchIndex.parse_query(query)
+        total, results = self.search_index.search(
+            terms, phrases,
+            to_epoch_us(start) if start else None,
+            to_epoch_us(end) if end else None,
+            limit
+        )
+        return {
+            'query': query,
+            'from': start,
+            'to': end,
+            'total': total,
+            'results': [dict(session.to_dict(), score=round(score, 4)) for score, session in results]
+        }
     
-    def get_dashboard_data(self) -> Dict:
-        """Get comprehensive dashboard data"""
-        status = self.get_progress_status()
-        
-        # Calculate stage progress
-        stage_progress = {}
+    @synchronized
+    def get_topic_coverage(self) -> Dict:
+        """Tracked hours for every plan topic by stage, plus studied topics outside the plan"""
+        index = self.topic_index
+        last_studied = lambda ordinal: date.fromordinal(ordinal).isoformat() if ordinal else None
+        stages = []
         for stage_num, stage_info in LEARNING_PLAN['stages'].items():
-            stage_hours = 0
-            stage_sessions = 0
-            
-            # Calculate hours for this stage based on sessions
-            for session in self.sessions_data:
-                session_date = datetime.fromisoformat(session['start_time'])
-                start_date = datetime.strptime(LEARNING_PLAN['start_date'], '%Y-%m-%d')
-                session_week = ((session_date - start_date).days // 7) + 1
-                
-                if session_week in stage_info['weeks']:
-                    stage_hours += session.get('duration', 0)
-                    stage_sessions += 1
-            
-            progress_percentage = min(100, (stage_hours / stage_info['hours']) * 100)
-            
-            stage_progress[stage_num] = {
+            completed = set(self.progress_data.get('completed_topics', {}).get(str(stage_num), []))
+            topics = []
+            for topic_index, topic in enumerate(stage_info['topics']):
+                hours, sessions, last_day = index.plan_totals(stage_num, topic_index)
+                topics.append({
+                    'index': topic_index,
+                    'topic': topic,
+                    'hours': round(hours, 2),
+                    'sessions': sessions,
+                    'last_studied': last_studied(last_day),
+                    'completed': topic_index in completed
+                })
+            studied = sum(1 for topic in topics if topic['sessions'])
+            stages.append({
+                'stage': stage_num,
                 'name': stage_info['name'],
-                'weeks': stage_info['weeks'],
-                'target_hours': stage_info['hours'],
-                'actual_hours': stage_hours,
-                'sessions': stage_sessions,
-                'progress_percentage': progress_percentage,
-                'status': self.get_stage_status(stage_num, status['current_week'])
+                'topics': topics,
+                'studied_topics': studied,
+                'coverage': studied / len(topics) if topics else 0,
+                'hours': round(sum(topic['hours'] for topic in topics), 2)
+            })
+        
+        other_topics = [
+            {'topic': label, 'hours': round(hours, 2), 'sessions': sessions, 'last_studied': last_studied(last_day)}
+            for label, hours, sessions, last_day in sorted(index.unplanned(), key=lambda entry: -entry[1])
+        ]
+        return {'stages': stages, 'other_topics': other_topics}
+    
+    @synchronized
+    def get_rollups(self, tier: str = 'auto', start: date = None, end: date = None) -> Dict:
+        """Per-period series and exact totals for the days start..end, read from the coarsest tier that fits"""
+        rollups = self.rollups
+        days = rollups.keys('day')
+        if start is None:
+            start = date.fromisoformat(days[0]) if days else date.today()
+        if end is None:
+            end = date.fromisoformat(days[-1]) if days else date.today()
+        if end < start:
+            raise ValueError('to must not be before from')
+        
+        if tier == 'auto':
+            span = (end - start).days + 1
+            tier = 'day' if span <= 31 else 'week' if span <= 26 * 7 else 'month'
+        if tier == 'stage':
+            # Stages overlapping the range; like edge periods of the other tiers, they may extend past it
+            series = [(key, bucket) for key, bucket in rollups.series('stage')
+                      if self.get_stage_start(int(key)) <= end and start <= self.get_stage_end(int(key))]
+            topics = set().union(*(bucket[2] for _, bucket in series))
+            totals = {
+                'hours': sum(bucket[0] for _, bucket in series),
+                'sessions': sum(bucket[1] for _, bucket in series),
+                'distinct_topics': len(topics),
+                'rows_read': len(series)
             }
+        elif tier in RollupStore.TIERS:
+            period = getattr(rollups, f'{tier}_key')
+            series = rollups.series(tier, period(start), period(end))  # edge periods may extend past the range
+            totals = rollups.totals(start, end)
+        else:
+            raise ValueError(f'Unknown tier: {tier}')
+        
+        return {
+            'tier': tier,
+            'from': start.isoformat(),
+            'to': end.isoformat(),
+            'series': [
+                {'period': key, 'hours': round(hours, 2), 'sessions': sessions, 'distinct_topics': len(topics)}
+                for key, (hours, sessions, topics) in series
+            ],
+            'totals': totals
+        }
+    
+    @synchronized
+    def get_stage_progress(self, stage_num: int, current_week: int = None) -> Dict:
+        """Hours, sessions and topic/project completion for a single stage"""
+        stage_info = LEARNING_PLAN['stages'][stage_num]
+        if current_week is None:
+            current_week = self.get_current_week()
         
-        # Get recent sessions
-        recent_sessions = sorted(
-            self.sessions_data, 
-            key=lambda x: x['start_time'], 
-            reverse=True
-        )[:10]
+        stage_hours = self.stage_totals[stage_num]['hours']
+        stage_sessions = self.stage_totals[stage_num]['sessions']
+        progress_percentage = min(100, (stage_hours / stage_info['hours']) * 100)
         
-        # Get weekly stats
-        weekly_stats = self.get_weekly_stats()
+        stage_key = str(stage_num)
+        completed_topics = list(self.progress_data.get('completed_topics', {}).get(stage_key, []))
+        completed_projects = list(self.progress_data.get('completed_projects', {}).get(stage_key, []))
         
         return {
-            'status': status,
-            'progress_data': self.progress_data,
-            'stage_progress': stage_progress,
-            'recent_sessions': recent_sessions,
-            'weekly_stats': weekly_stats,
-            'active_sessions': list(active_sessions.keys()),
-            'total_achievements': len(self.progress_data['achievements'])
+            'name': stage_info['name'],
+            'weeks': stage_info['weeks'],
+            'target_hours': stage_info['hours'],
+            'actual_hours': stage_hours,
+            'sessions': stage_sessions,
+            'progress_percentage': progress_percentage,
+            'status': self.get_stage_status(stage_num, current_week),
+            'completed_topics': completed_topics,
+            'completed_projects': completed_projects,
+            'topic_completion': len(completed_topics) / len(stage_info['topics']) if stage_info['topics'] else 0,
+            'project_completion': len(completed_projects) / len(stage_info['projects']) if stage_info['projects'] else 0
         }
     
     def get_stage_status(self, stage_num: int, current_week: int) -> str:
@@ -652,64 +2994,53 @@ class ProgressTracker:
         else:
             return 'upcoming'
     
-    def get_weekly_stats(self) -> List[Dict]:
-        """Get weekly statistics"""
-        weekly_stats = []
-        start_date = datetime.strptime(LEARNING_PLAN['start_date'], '%Y-%m-%d')
+    @synchronized
+    def get_weekly_stats(self, from_week: int = None, to_week: int = None) -> List[Dict]:
+        """Get weekly statistics, optionally for a window of weeks"""
+        current_week = self.get_current_week()
         
-        for week in range(1, self.get_current_week() + 1):
-            week_start = start_date + timedelta(weeks=week - 1)
-            week_end = week_start + timedelta(days=6)
-            
-            week_hours = 0
-            week_sessions = 0
+        # Cached until the next session is recorded or the week rolls over
+        if self._weekly_stats_cache is None or self._weekly_stats_cache[0] != current_week:
+            weekly_stats = []
             
-            for date_str, log in self.progress_data['daily_logs'].items():
-                log_date = datetime.strptime(date_str, '%Y-%m-%d')
-                if week_start <= log_date <= week_end:
-                    week_hours += log['hours']
-                    week_sessions += log['sessions']
+            for week in range(1, current_week + 1):
+                week_start = self.get_week_start(week)
+                week_end = week_start + timedelta(days=6)
+                
+                week_totals = self.week_totals.get(week, {'hours': 0, 'sessions': 0})
+                week_hours = week_totals['hours']
+                week_sessions = week_totals['sessions']
+                
+                weekly_stats.append({
+                    'week': week,
+                    'start_date': week_start.isoformat(),
+                    'end_date': week_end.isoformat(),
+                    'hours': week_hours,
+                    'sessions': week_sessions,
+                    'target_hours': LEARNING_PLAN['weekly_target'],
+                    'percentage': (week_hours / LEARNING_PLAN['weekly_target']) * 100
+                })
             
-            weekly_stats.append({
-                'week': week,
-                'start_date': week_start.isoformat(),
-                'end_date': week_end.isoformat(),
-                'hours': week_hours,
-                'sessions': week_sessions,
-                'target_hours': LEARNING_PLAN['weekly_target'],
-                'percentage': (week_hours / LEARNING_PLAN['weekly_target']) * 100
-            })
-        
-        return weekly_stats
+            self._weekly_stats_cache = (current_week, weekly_stats)
+        
+        weekly_stats = self._weekly_stats_cache[1]
+        first = 1 if from_week is None else from_week
+        last = current_week if to_week is None else to_week
+        if not 1 <= first <= current_week or not 1 <= last <= current_week:
+            raise ValueError(f'from and to must be weeks 1..{current_week}')
+        if last < first:
+            raise ValueError('to must not be before from')
+        return weekly_stats[first - 1:last]
     
+    @synchronized_write
     def add_manual_session(self, duration: float, notes: str = '', topics: List[str] = None,
                           mood: str = '', difficulty: int = 3, session_date: str = None) -> Dict:
         """Add a manual session with specified details"""
         try:
-            # Parse session date or use current date
-            if session_date:
-                session_datetime = datetime.fromisoformat(session_date)
-            else:
-                session_datetime = datetime.now()
-            
-            # Create session data
-            session_data = {
-                'id': str(uuid.uuid4()),
-                'user_id': 'default',
-                'start_time': session_datetime.isoformat(),
-                'end_time': session_datetime.isoformat(),
-                'duration': duration,
-                'notes': notes,
-                'topics': topics or [],
-                'mood': mood,
-                'difficulty': difficulty,
-                'status': 'completed',
-                'manual_entry': True
-            }
+            session_data = self.build_manual_session(duration, notes, topics, mood, difficulty, session_date)
             
-            # Save to sessions file
-            self.sessions_data.append(session_data)
-            self.save_json_file(SESSIONS_FILE, self.sessions_data)
+            # Save to session journal
+            self.append_session(session_data)
             
             # Update progress data
             self.progress_data['total_hours'] += duration
@@ -717,42 +3048,433 @@ class ProgressTracker:
             self.progress_data['updated_at'] = datetime.now().isoformat()
             
             # Update daily log
-            session_date_str = session_datetime.date().isoformat()
-            if session_date_str not in self.progress_data['daily_logs']:
-                self.progress_data['daily_logs'][session_date_str] = {
-                    'hours': 0,
-                    'sessions': 0,
-                    'topics': [],
-                    'notes': []
-                }
-            
-            self.progress_data['daily_logs'][session_date_str]['hours'] += duration
-            self.progress_data['daily_logs'][session_date_str]['sessions'] += 1
-            if topics:
-                self.progress_data['daily_logs'][session_date_str]['topics'].extend(topics)
-            if notes:
-                self.progress_data['daily_logs'][session_date_str]['notes'].append(notes)
+            session_date_str = session_data['start_time'][:10]
+            self.update_daily_log(session_date_str, duration, topics, notes)
             
             # Update streak
             self.update_streak()
             
             # Check achievements
-            self.check_achievements()
+            new_achievements = self.check_achievements()
             
             # Save progress data
-            self.save_json_file(PROGRESS_FILE, self.progress_data)
+            self.save_progress()
+            self.bump_version()
             
             return {
                 'success': True,
                 'session': session_data,
-                'new_achievements': self.get_recent_achievements()
+                'new_achievements': new_achievements
             }
             
         except Exception as e:
             return {'error': str(e)}
 
-# Initialize tracker
-tracker = ProgressTracker()
+    def build_manual_session(self, duration: float, notes: str = '', topics: List[str] = None,
+                             mood: str = '', difficulty: int = 3, session_date: str = None,
+                             session_id: str = None) -> Dict:
+        """Create the session record for a manually entered session"""
+        # Parse session date or use current date
+        if session_date:
+            session_datetime = datetime.fromisoformat(session_date)
+        else:
+            session_datetime = datetime.now()
+        
+        return {
+            'id': session_id or str(uuid.uuid4()),
+            'user_id': self.user_id,
+            'start_time': session_datetime.isoformat(),
+            'end_time': session_datetime.isoformat(),
+            'duration': duration,
+            'notes': notes,
+            'topics': topics or [],
+            'mood': mood,
+            'difficulty': difficulty,
+            'status': 'completed',
+            'manual_entry': True
+        }
+    
+    def validate_session_entry(self, entry: Any) -> Dict:
+        """Check one imported session and return add_manual_session-style arguments"""
+        if not isinstance(entry, dict):
+            raise ValueError('Entry must be an object')
+        
+        duration = entry.get('duration')
+        if isinstance(duration, bool) or not isinstance(duration, (int, float)):
+            raise ValueError('duration must be a number of hours')
+        if not 0 < duration <= 24:
+            raise ValueError('duration must be between 0 and 24 hours')
+        
+        # Accept add_manual_session's session_date or an exported session's start_time
+        session_date = entry.get('session_date') or entry.get('start_time')
+        if session_date is not None:
+            if not isinstance(session_date, str):
+                raise ValueError('session_date must be an ISO date or datetime string')
+            datetime.fromisoformat(session_date)
+        
+        topics = entry.get('topics') or []
+        if not isinstance(topics, list) or not all(isinstance(topic, str) for topic in topics):
+            raise ValueError('topics must be a list of strings')
+        
+        notes = entry.get('notes') or ''
+        mood = entry.get('mood') or ''
+        if not isinstance(notes, str) or not isinstance(mood, str):
+            raise ValueError('notes and mood must be strings')
+        
+        session_id = entry.get('id')
+        if session_id is not None and (not isinstance(session_id, str) or not session_id):
+            raise ValueError('id must be a non-empty string')
+        
+        difficulty = entry.get('difficulty', 3)
+        if isinstance(difficulty, bool) or not isinstance(difficulty, int) or not 1 <= difficulty <= 5:
+            raise ValueError('difficulty must be an integer from 1 to 5')
+        
+        return {
+            'duration': duration,
+            'notes': notes,
+            'topics': topics,
+            'mood': mood,
+            'difficulty': difficulty,
+            'session_date': session_date,
+            'session_id': session_id
+        }
+    
+    @synchronized_write
+    def add_sessions_bulk(self, entries: List[Any], partial: bool = False) -> Dict:
+        """Validate and import many sessions, recomputing derived state once"""
+        known_ids = {session.id for session in self.sessions_data}
+        sessions = []
+        errors = []
+        
+        for row, entry in enumerate(entries):
+            try:
+                if isinstance(entry, Exception):
+                    raise entry
+                session = self.build_manual_session(**self.validate_session_entry(entry))
+                if session['id'] in known_ids:
+                    raise ValueError(f"Duplicate session id: {session['id']}")
+                known_ids.add(session['id'])
+                sessions.append(session)
+            except (TypeError, ValueError) as e:
+                errors.append({'row': row, 'error': str(e)})
+        
+        # Without partial=True a single bad row rejects the whole batch
+        if errors and not partial:
+            sessions = []
+        
+        if sessions:
+            self.append_sessions(sessions)
+            
+            touched_dates = set()
+            for session in sessions:
+                self.progress_data['total_hours'] += session['duration']
+                self.progress_data['total_sessions'] += 1
+                session_date_str = session['start_time'][:10]
+                self.update_daily_log(session_date_str, session['duration'], session['topics'],
+                                      session['notes'], persist=False)
+                touched_dates.add(session_date_str)
+            
+            daily_logs = self.progress_data['daily_logs']
+            self.storage.save_daily_logs({date_str: daily_logs[date_str] for date_str in touched_dates})
+            
+            self.progress_data['updated_at'] = datetime.now().isoformat()
+            self.update_streak()
+            self.check_achievements()
+            self.save_progress()
+            self.bump_version()
+        
+        return {
+            'success': not errors,
+            'received': len(entries),
+            'imported': len(sessions),
+            'errors': errors
+        }
+    
+    @synchronized_write
+    def toggle_completion(self, key: str, stage_id: int, index: int) -> Dict:
+        """Toggle a topic or project index in completed_topics/completed_projects"""
+        stage_key = str(stage_id)
+        if key not in self.progress_data:
+            self.progress_data[key] = {}
+        if stage_key not in self.progress_data[key]:
+            self.progress_data[key][stage_key] = []
+        
+        completed = self.progress_data[key][stage_key]
+        
+        if index in completed:
+            completed.remove(index)
+            action = 'unchecked'
+        else:
+            completed.append(index)
+            action = 'checked'
+        
+        self.progress_data['updated_at'] = datetime.now().isoformat()
+        self.save_progress()
+        self.bump_version()
+        
+        return {'action': action, 'completed': list(completed)}
+    
+    @synchronized_write
+    def set_goals(self, daily_goal: float, weekly_goal: float) -> Dict:
+        """Set daily/weekly learning goals"""
+        if 'goals' not in self.progress_data:
+            self.progress_data['goals'] = {}
+        
+        self.progress_data['goals']['daily_hours'] = daily_goal
+        self.progress_data['goals']['weekly_hours'] = weekly_goal
+        self.progress_data['updated_at'] = datetime.now().isoformat()
+        
+        self.save_progress()
+        self.bump_version()
+        return dict(self.progress_data['goals'])
+    
+    @synchronized_write
+    def reset_all(self):
+        """Delete all sessions, progress and goals"""
+        default_progress = {
+            "total_hours": 0,
+            "total_sessions": 0,
+            "current_streak": 0,
+            "longest_streak": 0,
+            "last_session_date": None,
+            "achievements": [],
+            "daily_logs": {},
+            "stage_progress": {str(i): 0 for i in range(1, 9)},
+            "created_at": datetime.now().isoformat(),
+            "updated_at": datetime.now().isoformat(),
+            "completed_topics": {}
+        }
+        
+        # Clear stored sessions, progress and goals, then save reset data
+        self.storage.reset()
+        self.progress_data = default_progress
+        self._session_index = None
+        self._search_index = None
+        self.goals_data = {}
+        self.rebuild_derived_state()
+        self.save_progress()
+        self.bump_version()
+    
+    @synchronized
+    def get_learning_analytics(self) -> Dict:
+        """Best day, calendar weeks, velocity and time-of-day patterns from the analytics store"""
+        analytics = self.analytics
+        weekly_totals = analytics.weekly_totals(until=date.today())
+        weekly_hours = [week['hours'] for week in weekly_totals]
+        
+        return {
+            'total_days_learned': analytics.days_learned(),
+            'best_day': analytics.best_day(),
+            'weekly_totals': weekly_totals,
+            'weekly_hours': weekly_hours,
+            'velocity_trend': analytics.velocity_trend(weekly_hours),
+            'most_productive_hour': analytics.most_productive_hour(),
+            'hour_distribution': list(analytics.hour_sessions),
+            'day_of_week_hours': analytics.weekday_hours()
+        }
+    
+    @synchronized
+    def get_productivity_stats(self) -> Dict:
+        """Get detailed productivity statistics"""
+        progress_data = self.progress_data
+        stats = self.get_learning_analytics()
+        stats.update({
+            'avg_session_length': progress_data['total_hours'] / progress_data['total_sessions'] if progress_data['total_sessions'] > 0 else 0,
+            'consistency_score': min(100, (progress_data['current_streak'] / 7) * 100)  # out of 100
+        })
+        return stats
+        
+    def bump_version(self):
+        """Mark a mutation: invalidates ETags and cached read payloads"""
+        self.data_version += 1
+        self.payload_cache.clear()
+    
+    def get_etag(self, name: str) -> str:
+        """Strong ETag for a read payload at the current data version"""
+        # Payloads also depend on today's date (expected hours, current week, streak)
+        return f'{name}-{self.instance_id}-{self.data_version}-{date.today().isoformat()}'
+
+class TrackerRegistry:
+    """Per-user trackers loaded on first access and kept in a bounded LRU"""
+    
+    def __init__(self, max_loaded: int = TRACKER_CACHE_SIZE, idle_timeout: float = TRACKER_IDLE_TIMEOUT):
+        self.max_loaded = max_loaded
+        self.idle_timeout = idle_timeout
+        self._trackers = OrderedDict()  # user_id -> [tracker, last_used, requests using it], LRU first
+        self._flushing = {}  # user_id -> Event set once the evicted tracker's writes are on disk
+        self._loading = {}  # user_id -> Event set once the tracker is loaded (or failed to load)
+        self._lock = threading.Lock()
+    
+    def get(self, user_id: str = DEFAULT_USER) -> ProgressTracker:
+        """Return the user's tracker, loading it if needed"""
+        return self._get(user_id, hold=False)
+    
+    def acquire(self, user_id: str = DEFAULT_USER) -> ProgressTracker:
+        """Like get, but the tracker is not evicted until release() is called"""
+        return self._get(user_id, hold=True)
+    
+    def release(self, held_tracker: ProgressTracker):
+        with self._lock:
+            entry = self._trackers.get(held_tracker.user_id)
+            if entry is not None and entry[0] is held_tracker:
+                entry[2] -= 1
+    
+    def _get(self, user_id: str, hold: bool) -> ProgressTracker:
+        while True:
+            with self._lock:
+                pending = self._flushing.get(user_id) or self._loading.get(user_id)
+                if pending is None:
+                    entry = self._trackers.get(user_id)
+                    if entry is not None:
+                        evicted = self._touch(user_id, entry, hold)
+                        break
+                    self._loading[user_id] = threading.Event()
+            if pending is not None:
+                # Reloading before the evicted tracker is flushed would read stale files,
+                # and a tracker another request is loading is ready once it is set
+                pending.wait()
+                continue
+            # Load outside the registry lock so one cold user does not block everyone else
+            try:
+                loaded = ProgressTracker(user_id=user_id)
+                with self._lock:
+                    entry = [loaded, time.monotonic(), 0]
+                    self._trackers[user_id] = entry
+                    evicted = self._touch(user_id, entry, hold)
+            finally:
+                with self._lock:
+                    self._loading.pop(user_id).set()
+            break
+        
+        # Flush outside the registry lock so other users are not blocked on disk I/O
+        for evicted_tracker in evicted:
+            try:
+                evicted_tracker.flush()
+            finally:
+                with self._lock:
+                    self._flushing.pop(evicted_tracker.user_id).set()
+        return entry[0]
+    
+    def _touch(self, user_id: str, entry: list, hold: bool) -> List[ProgressTracker]:
+        """Mark the entry used and pop whatever that pushes out; the caller flushes the result"""
+        now = time.monotonic()
+        entry[1] = now
+        self._trackers.move_to_end(user_id)
+        if hold:
+            entry[2] += 1
+        evicted = self._pop_evictable(now)
+        for evicted_tracker in evicted:
+            self._flushing[evicted_tracker.user_id] = threading.Event()
+        return evicted
+    
+    def _pop_evictable(self, now: float) -> List[ProgressTracker]:
+        """Remove trackers over the size limit or idle too long, skipping any a request still holds"""
+        evicted = []
+        for user_id, (oldest, last_used, holders) in list(self._trackers.items()):
+            if len(self._trackers) <= self.max_loaded and now - last_used <= self.idle_timeout:
+                break
+            if holders:
+                continue
+            del self._trackers[user_id]
+            evicted.append(oldest)
+        return evicted
+    
+    def loaded_users(self) -> List[str]:
+        with self._lock:
+            return list(self._trackers)
+    
+    def flush_all(self):
+        """Write every loaded tracker's pending changes"""
+        with self._lock:
+            loaded = [entry[0] for entry in self._trackers.values()]
+        for loaded_tracker in loaded:
+            loaded_tracker.flush()
+
+
+trackers = TrackerRegistry()
+
+def current_tracker() -> ProgressTracker:
+    """Tracker for the user making this request (the default user outside requests)"""
+    if not has_request_context():
+        return trackers.get(DEFAULT_USER)
+    if 'tracker' not in g:
+        g.tracker = trackers.acquire(g.get('user_id', DEFAULT_USER))
+        g.tracker.refresh()
+    return g.tracker
+
+@app.teardown_request
+def release_tracker(exc=None):
+    """Let the registry evict this request's tracker again (streamed responses release when they finish)"""
+    if 'tracker' in g:
+        trackers.release(g.tracker)
+
+# Proxy to the current user's tracker, so handlers can keep using `tracker`
+tracker = LocalProxy(current_tracker)
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request_metrics(response):
+    """Count the request and record its latency and payload sizes"""
+    endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+    REQUEST_COUNT.inc(endpoint=endpoint, method=request.method, status=response.status_code)
+    if response.status_code >= 500:
+        REQUEST_ERRORS.inc(endpoint=endpoint, method=request.method)
+    if 'request_started' in g:
+        REQUEST_LATENCY.observe(time.perf_counter() - g.request_started, endpoint=endpoint, method=request.method)
+    if request.content_length:
+        REQUEST_SIZE.observe(request.content_length, endpoint=endpoint, method=request.method)
+    if response.is_streamed:
+        response.response = count_streamed_bytes(response.response, endpoint)
+    elif response.content_length is not None:
+        RESPONSE_SIZE.observe(response.content_length, endpoint=endpoint)
+    return response
+
+def count_streamed_bytes(chunks, endpoint: str):
+    """Pass a streamed body through, recording its size once it ends or the client goes away"""
+    size = 0
+    try:
+        for chunk in chunks:
+            size += len(chunk.encode('utf-8') if isinstance(chunk, str) else chunk)
+            yield chunk
+    finally:
+        RESPONSE_SIZE.observe(size, endpoint=endpoint)
+        close = getattr(chunks, 'close', None)
+        if close is not None:
+            close()
+
+@app.before_request
+def resolve_user():
+    """Pick the data partition from the X-User-Id header or ?user_id="""
+    user_id = request.headers.get('X-User-Id') or request.args.get('user_id') or DEFAULT_USER
+    if not USER_ID_PATTERN.match(user_id):
+        return jsonify({'error': 'Invalid user id'}), 400
+    g.user_id = user_id
+
+def versioned_json(name: str, build) -> Any:
+    """Serve build() as JSON with a strong ETag, reusing the payload until the next mutation"""
+    etag = tracker.get_etag(name)
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+    
+    # Build and serialise under the tracker lock so the payload is a consistent snapshot
+    with tracker.lock:
+        etag = tracker.get_etag(name)
+        cached = tracker.payload_cache.get(name)
+        if cached is None or cached[0] != etag:
+            with STAGE_LATENCY.time(stage=f'build_{name}'):
+                cached = (etag, app.json.dumps(build()) + '\n')
+            tracker.payload_cache[name] = cached
+    
+    response = app.response_class(cached[1], mimetype=app.json.mimetype)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'  # Always revalidate with If-None-Match
+    return response
 
 # Routes
 @app.route('/')
@@ -764,8 +3486,7 @@ def dashboard():
 def api_dashboard():
     """API endpoint for dashboard data"""
     try:
-        data = tracker.get_dashboard_data()
-        return jsonify(data)
+        return versioned_json('dashboard', tracker.get_dashboard_data)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -825,12 +3546,172 @@ def api_session_status(session_id):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def format_sse(event: str, data: Dict) -> str:
+    """Encode one Server-Sent Event"""
+    return f'event: {event}\ndata: {json.dumps(data, default=str)}\n\n'
+
+@app.route('/api/session/stream/<session_id>')
+def api_session_stream(session_id):
+    """Stream live session state changes and heartbeats as Server-Sent Events"""
+    try:
+        user_tracker = current_tracker()
+        # Subscribe before reading the state, so no event can fall in between
+        events = session_events.subscribe(session_id)
+        status = user_tracker.get_session_status(session_id)
+        if 'error' in status:
+            session_events.unsubscribe(session_id, events)
+            return jsonify(status), 404
+        
+        def stream():
+            try:
+                yield f'retry: {SSE_RETRY_MS}\n'
+                yield format_sse('state', status)
+                while True:
+                    try:
+                        event, data = events.get(timeout=SSE_HEARTBEAT_INTERVAL)
+                    except queue.Empty:
+                        # Heartbeat with the server-computed duration; also notices sessions
+                        # ended by another worker process
+                        heartbeat = user_tracker.get_session_status(session_id)
+                        if 'error' in heartbeat:
+                            yield format_sse('end', {'session_id': session_id})
+                            return
+                        yield format_sse('heartbeat', heartbeat)
+                        continue
+                    
+                    yield format_sse(event, data)
+                    if event == 'end':
+                        return
+            finally:
+                session_events.unsubscribe(session_id, events)
+        
+        # Keep the request context, and so the held tracker, until the stream closes
+        response = app.response_class(stream_with_context(stream()), mimetype='text/event-stream')
+        response.headers['Cache-Control'] = 'no-cache'
+        response.headers['X-Accel-Buffering'] = 'no'  # Disable proxy buffering
+        return response
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/progress/status')
 def api_progress_status():
     """Get detailed progress status"""
     try:
-        status = tracker.get_progress_status()
-        return jsonify(status)
+        return versioned_json('progress-status', tracker.get_progress_status)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/weekly-stats')
+def api_weekly_stats():
+    """Get weekly statistics, optionally limited to weeks from..to"""
+    try:
+        from_week = request.args.get('from', type=int)
+        to_week = request.args.get('to', type=int)
+        try:
+            return jsonify(tracker.get_weekly_stats(from_week, to_week))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/streaks')
+def api_streaks():
+    """Get current, longest and historical learning streaks"""
+    try:
+        min_days = request.args.get('min_days', 1, type=int)
+        return jsonify(tracker.get_streak_history(min_days))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/sessions')
+def api_list_sessions():
+    """Browse completed sessions newest first, one cursor page at a time"""
+    try:
+        try:
+            start, end = parse_range_args()
+            limit = min(max(int(request.args.get('limit', SESSION_PAGE_SIZE)), 1), SESSION_PAGE_MAX)
+            page = tracker.list_sessions(limit, request.args.get('cursor'), start, end)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        return jsonify(page)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/sessions/range')
+def api_sessions_range():
+    """Sessions that started between ?from= and ?to=, optionally with a given ?topic="""
+    try:
+        try:
+            start, end = parse_range_args()
+        except ValueError as e:
+            return jsonify({'error': f'Invalid date range: {e}'}), 400
+        return jsonify(tracker.get_sessions_in_range(start, end, request.args.get('topic')))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/search')
+def api_search():
+    """Full-text search of session notes and topics: ?q=words "exact phrase"&from=&to=&limit="""
+    try:
+        query = request.args.get('q', '').strip()
+        if not query:
+            return jsonify({'error': 'Query parameter q required'}), 400
+        try:
+            start, end = parse_range_args()
+            limit = min(max(int(request.args.get('limit', SESSION_PAGE_SIZE)), 1), SEARCH_RESULTS_MAX)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        return jsonify(tracker.search_sessions(query, start, end, limit))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/topics')
+def api_topics():
+    """Hours, sessions and last study date for each plan topic, by stage"""
+    try:
+        return versioned_json('topics', tracker.get_topic_coverage)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/rollups')
+def api_rollups():
+    """Hours, sessions and distinct topics per day, week, month or stage: ?tier=auto&from=&to="""
+    try:
+        try:
+            start, end = parse_range_args()
+            start = datetime.fromisoformat(start).date() if start else None
+            end = (datetime.fromisoformat(end) - timedelta(microseconds=1)).date() if end else None
+            result = tracker.get_rollups(request.args.get('tier', 'auto'), start, end)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        return jsonify(result)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/sessions/bulk', methods=['POST'])
+def api_bulk_sessions():
+    """Import many manual sessions from a JSON array or an NDJSON upload"""
+    try:
+        upload = request.files.get('file')
+        if upload is not None or request.mimetype == 'application/x-ndjson':
+            raw = upload.read() if upload is not None else request.get_data()
+            entries = []
+            for line in raw.decode('utf-8').splitlines():
+                if not line.strip():
+                    continue
+                try:
+                    entries.append(json.loads(line))
+                except ValueError as e:
+                    entries.append(ValueError(f'Invalid JSON: {e}'))
+        else:
+            data = request.get_json(silent=True)
+            entries = data.get('sessions') if isinstance(data, dict) else data
+            if not isinstance(entries, list):
+                return jsonify({'error': 'Expected a JSON array of sessions or an NDJSON upload'}), 400
+        
+        partial = request.args.get('partial', '0').lower() in ('1', 'true', 'yes')
+        result = tracker.add_sessions_bulk(entries, partial=partial)
+        return jsonify(result), 200 if result['success'] or result['imported'] else 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -843,21 +3724,8 @@ def api_stage_details(stage_id):
         
         stage_info = LEARNING_PLAN['stages'][stage_id].copy()
         
-        # Add current progress for this stage
-        dashboard_data = tracker.get_dashboard_data()
-        if str(stage_id) in dashboard_data['stage_progress']:
-            stage_progress = dashboard_data['stage_progress'][str(stage_id)]
-            stage_info.update({
-                'actual_hours': stage_progress['actual_hours'],
-                'progress_percentage': stage_progress['progress_percentage'],
-                'sessions': stage_progress['sessions'],
-                'status': stage_progress['status']
-            })
-        
-        # Add completion data
-        stage_key = str(stage_id)
-        stage_info['completed_topics'] = tracker.progress_data.get('completed_topics', {}).get(stage_key, [])
-        stage_info['completed_projects'] = tracker.progress_data.get('completed_projects', {}).get(stage_key, [])
+        # Add current progress and completion data for this stage
+        stage_info.update(tracker.get_stage_progress(stage_id))
         
         return jsonify(stage_info)
     except Exception as e:
@@ -873,25 +3741,9 @@ def api_toggle_topic(stage_id):
         if topic_index is None:
             return jsonify({'error': 'Topic index required'}), 400
         
-        stage_key = str(stage_id)
-        if 'completed_topics' not in tracker.progress_data:
-            tracker.progress_data['completed_topics'] = {}
-        if stage_key not in tracker.progress_data['completed_topics']:
-            tracker.progress_data['completed_topics'][stage_key] = []
-        
-        completed_topics = tracker.progress_data['completed_topics'][stage_key]
-        
-        if topic_index in completed_topics:
-            completed_topics.remove(topic_index)
-            action = 'unchecked'
-        else:
-            completed_topics.append(topic_index)
-            action = 'checked'
-        
-        tracker.progress_data['updated_at'] = datetime.now().isoformat()
-        tracker.save_json_file(PROGRESS_FILE, tracker.progress_data)
+        result = tracker.toggle_completion('completed_topics', stage_id, topic_index)
         
-        return jsonify({'success': True, 'action': action, 'completed_topics': completed_topics})
+        return jsonify({'success': True, 'action': result['action'], 'completed_topics': result['completed']})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -905,39 +3757,106 @@ def api_toggle_project(stage_id):
         if project_index is None:
             return jsonify({'error': 'Project index required'}), 400
         
-        stage_key = str(stage_id)
-        if 'completed_projects' not in tracker.progress_data:
-            tracker.progress_data['completed_projects'] = {}
-        if stage_key not in tracker.progress_data['completed_projects']:
-            tracker.progress_data['completed_projects'][stage_key] = []
-        
-        completed_projects = tracker.progress_data['completed_projects'][stage_key]
-        
-        if project_index in completed_projects:
-            completed_projects.remove(project_index)
-            action = 'unchecked'
-        else:
-            completed_projects.append(project_index)
-            action = 'checked'
+        result = tracker.toggle_completion('completed_projects', stage_id, project_index)
         
-        tracker.progress_data['updated_at'] = datetime.now().isoformat()
-        tracker.save_json_file(PROGRESS_FILE, tracker.progress_data)
-        
-        return jsonify({'success': True, 'action': action, 'completed_projects': completed_projects})
+        return jsonify({'success': True, 'action': result['action'], 'completed_projects': result['completed']})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+EXPORT_CSV_FIELDS = [
+    'id', 'user_id', 'start_time', 'end_time', 'duration', 'topics',
+    'mood', 'difficulty', 'status', 'manual_entry', 'notes'
+]
+
+def parse_range_args() -> tuple:
+    """Read ?from=&to= as ISO dates/datetimes; a date-only 'to' includes that whole day"""
+    start = request.args.get('from')
+    end = request.args.get('to')
+    if start:
+        start = datetime.fromisoformat(start).isoformat()
+    if end:
+        if len(end) == 10:
+            end = (datetime.fromisoformat(end) + timedelta(days=1)).isoformat()
+        else:
+            end = datetime.fromisoformat(end).isoformat()
+    return start, end
+
+def generate_export(export_format: str, sessions) -> Any:
+    """Yield export text in chunks of roughly EXPORT_CHUNK_SIZE characters"""
+    buffer = io.StringIO()
+    
+    if export_format == 'csv':
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_CSV_FIELDS)
+        for session in sessions:
+            row = dict(session, topics=';'.join(session.get('topics') or []))
+            writer.writerow([row.get(field, '') for field in EXPORT_CSV_FIELDS])
+            if buffer.tell() >= EXPORT_CHUNK_SIZE:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+    elif export_format == 'ndjson':
+        for session in sessions:
+            buffer.write(json.dumps(session, default=str) + '\n')
+            if buffer.tell() >= EXPORT_CHUNK_SIZE:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+    else:
+        # Single JSON document with the session list streamed last
+        with tracker.lock:
+            buffer.write('{"progress": ' + json.dumps(tracker.progress_data, default=str))
+            buffer.write(', "goals": ' + json.dumps(tracker.goals_data, default=str))
+        buffer.write(', "exported_at": ' + json.dumps(datetime.now().isoformat()))
+        buffer.write(', "sessions": [')
+        separator = ''
+        for session in sessions:
+            buffer.write(separator + json.dumps(session, default=str))
+            separator = ', '
+            if buffer.tell() >= EXPORT_CHUNK_SIZE:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        buffer.write(']}')
+    
+    yield buffer.getvalue()
+
+def gzip_stream(chunks) -> Any:
+    """Compress a stream of text chunks into gzip format on the fly"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8'))
+        if data:
+            yield data
+    yield compressor.flush()
+
 @app.route('/api/export')
 def api_export():
-    """Export all data as JSON"""
+    """Export data as a streamed JSON, NDJSON or CSV download"""
     try:
-        export_data = {
-            'progress': tracker.progress_data,
-            'sessions': tracker.sessions_data,
-            'goals': tracker.goals_data,
-            'exported_at': datetime.now().isoformat()
-        }
-        return jsonify(export_data)
+        export_format = request.args.get('format', 'json')
+        if export_format not in EXPORT_MIMETYPES:
+            return jsonify({'error': f'Unsupported format: {export_format}'}), 400
+        
+        try:
+            start, end = parse_range_args()
+        except ValueError as e:
+            return jsonify({'error': f'Invalid date range: {e}'}), 400
+        # Always the requesting user's partition; ?user_id= picks the partition, not a filter
+        sessions = tracker.storage.iter_sessions(start, end)
+        
+        chunks = generate_export(export_format, sessions)
+        mimetype = EXPORT_MIMETYPES[export_format]
+        filename = f'learning-export.{export_format}'
+        if request.args.get('gzip', '0').lower() in ('1', 'true', 'yes'):
+            chunks = gzip_stream(chunks)
+            mimetype = 'application/gzip'
+            filename += '.gz'
+        
+        response = app.response_class(stream_with_context(chunks), mimetype=mimetype)
+        if export_format != 'json' or filename.endswith('.gz'):
+            response.headers['Content-Disposition'] = f'attachment; filename={filename}'
+        return response
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -945,27 +3864,7 @@ def api_export():
 def reset_all_data():
     """Reset all progress data - use with caution!"""
     try:
-        # Reset progress data
-        default_progress = {
-            "total_hours": 0,
-            "total_sessions": 0,
-            "current_streak": 0,
-            "longest_streak": 0,
-            "last_session_date": None,
-            "achievements": [],
-            "daily_logs": {},
-            "stage_progress": {str(i): 0 for i in range(1, 9)},
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat(),
-            "completed_topics": {}
-        }
-        
-        # Reset sessions data
-        default_sessions = []
-        
-        # Save reset data
-        tracker.save_json_file(PROGRESS_FILE, default_progress)
-        tracker.save_json_file(SESSIONS_FILE, default_sessions)
+        tracker.reset_all()
         
         return jsonify({
             'success': True,
@@ -983,21 +3882,11 @@ def set_learning_goal():
         daily_goal = data.get('daily_goal', 2)  # hours
         weekly_goal = data.get('weekly_goal', 12)  # hours
         
-        # Load and update progress data
-        progress_data = tracker.progress_data
-        
-        if 'goals' not in progress_data:
-            progress_data['goals'] = {}
-            
-        progress_data['goals']['daily_hours'] = daily_goal
-        progress_data['goals']['weekly_hours'] = weekly_goal
-        progress_data['updated_at'] = datetime.now().isoformat()
-        
-        tracker.save_json_file(PROGRESS_FILE, progress_data)
+        goals = tracker.set_goals(daily_goal, weekly_goal)
         
         return jsonify({
             'success': True,
-            'goals': progress_data['goals']
+            'goals': goals
         })
         
     except Exception as e:
@@ -1007,63 +3896,7 @@ def set_learning_goal():
 def get_productivity_stats():
     """Get detailed productivity statistics"""
     try:
-        progress_data = tracker.progress_data
-        
-        # Calculate productivity metrics
-        daily_logs = progress_data.get('daily_logs', {})
-        total_days = len(daily_logs)
-        
-        # Best day
-        best_day = {'date': None, 'hours': 0}
-        for date, log in daily_logs.items():
-            if log['hours'] > best_day['hours']:
-                best_day = {'date': date, 'hours': log['hours']}
-        
-        # Weekly trends
-        weekly_hours = []
-        sorted_dates = sorted(daily_logs.keys())
-        
-        for i in range(0, len(sorted_dates), 7):
-            week_dates = sorted_dates[i:i+7]
-            week_hours = sum(daily_logs[date]['hours'] for date in week_dates)
-            weekly_hours.append(week_hours)
-        
-        # Learning velocity (hours per week trend)
-        velocity_trend = 'stable'
-        if len(weekly_hours) >= 2:
-            recent_avg = sum(weekly_hours[-2:]) / len(weekly_hours[-2:])
-            older_avg = sum(weekly_hours[:-2]) / len(weekly_hours[:-2]) if len(weekly_hours) > 2 else recent_avg
-            
-            if recent_avg > older_avg * 1.1:
-                velocity_trend = 'increasing'
-            elif recent_avg < older_avg * 0.9:
-                velocity_trend = 'decreasing'
-        
-        # Most productive time patterns
-        session_times = []
-        sessions_data = tracker.sessions_data
-        for session in sessions_data:
-            if session.get('start_time'):
-                hour = datetime.fromisoformat(session['start_time']).hour
-                session_times.append(hour)
-        
-        # Find most common hour
-        most_productive_hour = None
-        if session_times:
-            from collections import Counter
-            hour_counts = Counter(session_times)
-            most_productive_hour = hour_counts.most_common(1)[0][0]
-        
-        return jsonify({
-            'total_days_learned': total_days,
-            'best_day': best_day,
-            'weekly_hours': weekly_hours,
-            'velocity_trend': velocity_trend,
-            'most_productive_hour': most_productive_hour,
-            'avg_session_length': progress_data['total_hours'] / progress_data['total_sessions'] if progress_data['total_sessions'] > 0 else 0,
-            'consistency_score': min(100, (progress_data['current_streak'] / 7) * 100)  # out of 100
-        })
-        
+        return versioned_json('productivity-stats', tracker.get_productivity_stats)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -1123,10 +3956,10 @@ def get_learning_insights():
                 'message': f'{completed_stages} stage(s) completed! You\'re systematically mastering your learning path.'
             })
         
-        # Recent activity insight
-        daily_logs = progress_data.get('daily_logs', {})
-        recent_dates = sorted(daily_logs.keys())[-7:] if daily_logs else []
-        recent_hours = sum(daily_logs[date]['hours'] for date in recent_dates)
+        # Recent activity insight (current calendar week)
+        analytics = tracker.get_learning_analytics()
+        weekly_totals = analytics['weekly_totals']
+        recent_hours = weekly_totals[-1]['hours'] if weekly_totals else 0
         
         if recent_hours > 0:
             insights.append({
@@ -1136,6 +3969,23 @@ def get_learning_insights():
                 'message': f'{recent_hours:.1f} hours of learning this week. You\'re staying consistent!'
             })
         
+        if analytics['velocity_trend'] == 'increasing':
+            insights.append({
+                'type': 'trend',
+                'icon': '🚀',
+                'title': 'Picking Up Speed',
+                'message': 'Your weekly hours over the last two weeks are above your earlier average.'
+            })
+        
+        best_day = analytics['best_day']
+        if best_day['date']:
+            insights.append({
+                'type': 'achievement',
+                'icon': '🏅',
+                'title': 'Personal Best',
+                'message': f'Your best day so far was {best_day["date"]} with {best_day["hours"]:.1f} hours.'
+            })
+        
         # Recommendations
         recommendations = []
         
@@ -1147,6 +3997,25 @@ def get_learning_insights():
                 'message': 'Begin a learning streak today! Even 15 minutes counts toward building a habit.'
             })
         
+        if analytics['velocity_trend'] == 'decreasing':
+            recommendations.append({
+                'type': 'motivation',
+                'icon': '📉',
+                'title': 'Regain Momentum',
+                'message': 'Your last two weeks are below your earlier weekly average. Plan a few focused sessions this week.'
+            })
+        
+        peak_hour = analytics['most_productive_hour']
+        day_of_week_hours = analytics['day_of_week_hours']
+        if peak_hour is not None and any(day_of_week_hours.values()):
+            best_weekday = max(day_of_week_hours, key=day_of_week_hours.get)
+            recommendations.append({
+                'type': 'improvement',
+                'icon': '🗓️',
+                'title': 'Protect Your Peak Time',
+                'message': f'You most often start sessions around {peak_hour:02d}:00 and learn most on {best_weekday}s. Schedule your hardest topics then.'
+            })
+        
         if total_hours > 0 and total_sessions > 0:
             avg_session = total_hours / total_sessions
             if avg_session < 0.5:
@@ -1166,12 +4035,21 @@ def get_learning_insights():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/metrics')
+def prometheus_metrics():
+    """Request, stage and disk-write metrics in the Prometheus text format"""
+    return app.response_class(metrics.render(), mimetype='text/plain; version=0.0.4')
+
 @app.route('/static/<path:filename>')
 def static_files(filename):
     """Serve static files"""
     return send_from_directory('static', filename)
 
 if __name__ == '__main__':
+    if sys.argv[1:] == ['migrate-sqlite']:
+        migrate_json_to_sqlite()
+        sys.exit(0)
+    
     print("🎯 Learning Progress Tracker Starting...")
     print(f"📊 Data will be stored in: {DATA_DIR}")
     print(f"🌐 Access the tracker at: http://localhost:5000")
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Learning Progress Tracker Benchmarks
+Seeded synthetic data generator and timing suite for the tracker's hot paths
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, Iterator, List
+from urllib.parse import quote
+
+import app
+
+# Named data scales: days of history and average sessions per learning day
+SCALES = {
+    'small': {'days': 90, 'sessions_per_day': 2},
+    'medium': {'days': 365, 'sessions_per_day': 5},
+    'large': {'days': 1095, 'sessions_per_day': 15},  # 3 years, ~15k sessions
+    'xlarge': {'days': 1095, 'sessions_per_day': 46},  # 3 years, ~50k sessions
+}
+DEFAULT_SCALES = ['small', 'medium', 'large']
+
+IMPORT_BATCH_SIZE = 5000
+HEAVY_REPEAT = 5  # samples for cases that reload or rebuild everything
+
+TOPIC_POOL = [topic for stage in app.LEARNING_PLAN['stages'].values() for topic in stage['topics']]
+MOODS = ['focused', 'tired', 'motivated', 'distracted', 'energized', '']
+NOTE_WORDS = (
+    'reviewed implemented debugged refactored read practiced model data query index cache '
+    'pipeline feature gradient tensor schema api test deploy notebook paper chapter exercise'
+).split()
+SEARCH_QUERIES = ['gradient', 'practiced reviewed', '"paper reviewed"']  # word, AND, phrase
+
+
+def generate_sessions(seed: int, days: int, sessions_per_day: int, topics_per_session: int = 2,
+                      notes_words: int = 12, rest_probability: float = 0.1,
+                      end_date: date = None) -> Iterator[Dict]:
+    """Yield bulk-import session entries for `days` days ending yesterday, deterministically"""
+    rng = random.Random(seed)
+    end_date = end_date or date.today() - timedelta(days=1)
+    first_day = end_date - timedelta(days=days - 1)
+
+    for offset in range(days):
+        if rng.random() < rest_probability:
+            continue
+        day = first_day + timedelta(days=offset)
+        count = rng.randint(max(1, sessions_per_day // 2), sessions_per_day + sessions_per_day // 2)
+        for minute in sorted(rng.sample(range(6 * 60, 23 * 60), count)):
+            start_time = datetime(day.year, day.month, day.day, minute // 60, minute % 60)
+            yield {
+                'id': str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+                'start_time': start_time.isoformat(),
+                'duration': round(rng.uniform(0.25, 3.0), 2),
+                'topics': rng.sample(TOPIC_POOL, topics_per_session),
+                'notes': ' '.join(rng.choices(NOTE_WORDS, k=notes_words)),
+                'mood': rng.choice(MOODS),
+                'difficulty': rng.randint(1, 5)
+            }
+
+def populate_user(user_id: str, entries: Iterator[Dict]) -> int:
+    """Import generated sessions for one user through the bulk import path"""
+    tracker = app.trackers.get(user_id)
+    imported = 0
+    batch = []
+    for entry in entries:
+        batch.append(entry)
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            imported += tracker.add_sessions_bulk(batch)['imported']
+            batch = []
+    if batch:
+        imported += tracker.add_sessions_bulk(batch)['imported']
+    tracker.flush()
+    return imported
+
+def use_data_dir(data_dir: str):
+    """Point the application's storage at a scratch data directory"""
+    app.DATA_DIR = data_dir
+    app.USERS_DIR = os.path.join(data_dir, 'users')
+    app.SQLITE_FILE = os.path.join(data_dir, 'tracker.db')
+    os.makedirs(app.USERS_DIR, exist_ok=True)
+    if app.STORAGE_BACKEND == 'sqlite' and not os.path.exists(app.SQLITE_FILE):
+        # Create the database up front so the one-shot JSON migration never reads real data
+        app.SQLiteStorage(app.SQLITE_FILE, user_id=app.DEFAULT_USER)
+    app.trackers = app.TrackerRegistry()
+
+def time_case(func: Callable[[], Any], repeat: int, setup: Callable[[], Any] = None) -> Dict:
+    """Run func once to warm up, then `repeat` timed samples; times in milliseconds"""
+    if setup:
+        setup()
+    func()
+    samples = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        'repeat': repeat,
+        'min_ms': round(samples[0], 4),
+        'median_ms': round(statistics.median(samples), 4),
+        'mean_ms': round(statistics.fmean(samples), 4),
+        'p95_ms': round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 4),
+        'max_ms': round(samples[-1], 4)
+    }
+
+def method_cases(tracker: app.ProgressTracker) -> List[tuple]:
+    """(name, callable, heavy) for each ProgressTracker hot path"""
+    def rebuild():
+        with tracker.lock:
+            tracker.rebuild_derived_state()
+
+    today = date.today()
+    month_ago, year_ago = (today - timedelta(days=30)).isoformat(), (today - timedelta(days=365)).isoformat()
+    return [
+        ('get_dashboard_data', tracker.get_dashboard_data, False),
+        ('get_progress_status', tracker.get_progress_status, False),
+        ('get_weekly_stats', tracker.get_weekly_stats, False),
+        ('calculate_expected_hours', tracker.calculate_expected_hours, False),
+        ('update_streak', tracker.update_streak, False),
+        ('get_streak_history', tracker.get_streak_history, False),
+        ('get_stage_progress', lambda: tracker.get_stage_progress(1), False),
+        ('get_productivity_stats', tracker.get_productivity_stats, False),
+        ('list_sessions', tracker.list_sessions, False),
+        ('get_sessions_in_range (30 days)', lambda: tracker.get_sessions_in_range(month_ago), False),
+        ('search_sessions (word)', lambda: tracker.search_sessions(SEARCH_QUERIES[0]), False),
+        ('search_sessions (AND)', lambda: tracker.search_sessions(SEARCH_QUERIES[1]), False),
+        ('search_sessions (phrase)', lambda: tracker.search_sessions(SEARCH_QUERIES[2]), False),
+        ('get_topic_coverage', tracker.get_topic_coverage, False),
+        ('get_rollups (365 days)', lambda: tracker.get_rollups('auto', date.fromisoformat(year_ago), today), False),
+        ('build SearchIndex', lambda: app.SearchIndex(tracker.sessions_data), True),
+        ('build TopicIndex', lambda: app.TopicIndex.build(tracker.sessions_data), True),
+        ('build RollupStore',
+         lambda: app.RollupStore.build(tracker.sessions_data, tracker.get_session_stage), True),
+        ('rebuild_derived_state', rebuild, True),
+        ('load_data', tracker.load_data, True),
+        ('load_sessions', lambda: app.create_storage(user_id=tracker.user_id).load_sessions(), True),
+    ]
+
+def route_cases(client, user_id: str) -> List[tuple]:
+    """(name, callable, heavy) for each read route plus a start/end session round trip"""
+    headers = {'X-User-Id': user_id}
+
+    def get(path):
+        def request():
+            response = client.get(path, headers=headers)
+            response.get_data()  # Drain streamed bodies
+            assert response.status_code == 200, (path, response.status_code)
+        return request
+
+    def session_round_trip():
+        session_id = client.post('/api/session/start', headers=headers).get_json()['session_id']
+        response = client.post('/api/session/end', headers=headers,
+                               json={'session_id': session_id, 'topics': TOPIC_POOL[:1]})
+        assert response.status_code == 200, response.status_code
+
+    today = date.today()
+    month_ago, year_ago = (today - timedelta(days=30)).isoformat(), (today - timedelta(days=365)).isoformat()
+    return [
+        ('GET /api/dashboard', get('/api/dashboard'), False),
+        ('GET /api/progress/status', get('/api/progress/status'), False),
+        ('GET /api/weekly-stats', get('/api/weekly-stats'), False),
+        ('GET /api/streaks', get('/api/streaks'), False),
+        ('GET /api/sessions', get('/api/sessions?limit=50'), False),
+        ('GET /api/sessions/range (30 days)', get(f'/api/sessions/range?from={month_ago}'), False),
+        ('GET /api/search', get(f'/api/search?q={quote(SEARCH_QUERIES[1])}'), False),
+        ('GET /api/search (phrase)', get(f'/api/search?q={quote(SEARCH_QUERIES[2])}'), False),
+        ('GET /api/topics', get('/api/topics'), False),
+        ('GET /api/rollups (365 days)', get(f'/api/rollups?from={year_ago}&to={today.isoformat()}'), False),
+        ('GET /api/stage/1', get('/api/stage/1'), False),
+        ('GET /api/productivity-stats', get('/api/productivity-stats'), False),
+        ('GET /api/learning-insights', get('/api/learning-insights'), False),
+        ('GET /api/export?format=ndjson', get('/api/export?format=ndjson'), True),
+        ('POST /api/session/start+end', session_round_trip, False),
+    ]
+
+def run_scale(scale: str, config: Dict, args) -> List[Dict]:
+    """Generate one data scale in a scratch directory and time every case against it"""
+    data_dir = os.path.join(args.data_dir, scale) if args.data_dir else tempfile.mkdtemp(prefix='tracker-bench-')
+    use_data_dir(data_dir)
+
+    users = [f'bench-{i}' for i in range(args.users)]
+    started = time.perf_counter()
+    sessions = 0
+    for i, user_id in enumerate(users):
+        entries = generate_sessions(args.seed + i, config['days'], config['sessions_per_day'],
+                                    args.topics_per_session, args.notes_words)
+        sessions += populate_user(user_id, entries)
+    generate_seconds = time.perf_counter() - started
+    print(f'[{scale}] {sessions} sessions for {len(users)} user(s) over {config["days"]} days '
+          f'generated in {generate_seconds:.1f}s', file=sys.stderr)
+
+    results = []
+    if not args.generate_only:
+        tracker = app.trackers.get(users[0])
+        client = app.app.test_client()
+
+        def base(kind, name):
+            return {'scale': scale, 'kind': kind, 'name': name, 'sessions': len(tracker.sessions_data),
+                    'users': len(users), 'days': config['days']}
+
+        for name, func, heavy in method_cases(tracker):
+            timing = time_case(func, HEAVY_REPEAT if heavy else args.repeat)
+            results.append(dict(base('method', name), **timing))
+        # Routes rebuild their payload each sample, as after any write
+        for name, func, heavy in route_cases(client, users[0]):
+            timing = time_case(func, HEAVY_REPEAT if heavy else args.repeat, setup=tracker.bump_version)
+            results.append(dict(base('route', name), **timing))
+
+    app.trackers.flush_all()
+    app.persistence.flush(wait=True)
+    if not args.data_dir:
+        shutil.rmtree(data_dir, ignore_errors=True)
+    return results
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(results: List[Dict], baseline_path: str):
+    """Print the median ratio of each case against a previous results file"""
+    with open(baseline_path, 'r') as f:
+        baseline = {
+            (row['scale'], row['kind'], row['name']): row for row in json.load(f)['results']
+        }
+    print(f'\n{"scale":<8} {"case":<42} {"baseline":>10} {"current":>10} {"ratio":>7}')
+    for row in results:
+        previous = baseline.get((row['scale'], row['kind'], row['name']))
+        if not previous:
+            continue
+        ratio = row['median_ms'] / previous['median_ms'] if previous['median_ms'] else float('inf')
+        print(f'{row["scale"]:<8} {row["name"]:<42} {previous["median_ms"]:>10.3f} '
+              f'{row["median_ms"]:>10.3f} {ratio:>6.2f}x')
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--scales', default=','.join(DEFAULT_SCALES),
+                        help=f'comma-separated scales from {", ".join(SCALES)}')
+    parser.add_argument('--days', type=int, help='custom scale: days of history')
+    parser.add_argument('--sessions-per-day', type=int, help='custom scale: average sessions per day')
+    parser.add_argument('--users', type=int, default=1, help='learners to generate per scale')
+    parser.add_argument('--topics-per-session', type=int, default=2)
+    parser.add_argument('--notes-words', type=int, default=12, help='words of notes per session')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--repeat', type=int, default=20, help='timed samples per case')
+    parser.add_argument('--data-dir', help='keep generated data here instead of a temp directory')
+    parser.add_argument('--generate-only', action='store_true', help='generate data without timing')
+    parser.add_argument('--output', default='benchmark_results.json', help='JSON results file')
+    parser.add_argument('--compare', help='previous results file to compare medians against')
+    args = parser.parse_args(argv)
+
+    if args.days or args.sessions_per_day:
+        scales = {'custom': {'days': args.days or 365, 'sessions_per_day': args.sessions_per_day or 4}}
+    else:
+        names = [name.strip() for name in args.scales.split(',') if name.strip()]
+        unknown = [name for name in names if name not in SCALES]
+        if unknown:
+            parser.error(f'unknown scale(s): {", ".join(unknown)}')
+        scales = {name: SCALES[name] for name in names}
+
+    results = []
+    for scale, config in scales.items():
+        results.extend(run_scale(scale, config, args))
+    if args.generate_only:
+        return
+
+    report = {
+        'meta': {
+            'revision': git_revision(),
+            'created_at': datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'storage_backend': app.STORAGE_BACKEND,
+            'seed': args.seed,
+            'scales': scales,
+            'users': args.users,
+            'topics_per_session': args.topics_per_session,
+            'notes_words': args.notes_words,
+            'repeat': args.repeat
+        },
+        'results': results
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    print(f'\n{"scale":<8} {"kind":<7} {"case":<42} {"median ms":>10} {"p95 ms":>10}')
+    for row in results:
+        print(f'{row["scale"]:<8} {row["kind"]:<7} {row["name"]:<42} '
+              f'{row["median_ms"]:>10.3f} {row["p95_ms"]:>10.3f}')
+    print(f'\nResults written to {args.output}')
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
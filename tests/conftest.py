@@ -0,0 +1,25 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as tracker_app  # noqa: E402
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """Point the application's storage at an empty scratch directory"""
+    monkeypatch.setattr(tracker_app, 'DATA_DIR', str(tmp_path))
+    monkeypatch.setattr(tracker_app, 'USERS_DIR', str(tmp_path / 'users'))
+    monkeypatch.setattr(tracker_app, 'SQLITE_FILE', str(tmp_path / 'tracker.db'))
+    monkeypatch.setattr(tracker_app, 'STORAGE_BACKEND', 'json')
+    monkeypatch.setattr(tracker_app, 'trackers', tracker_app.TrackerRegistry())
+    yield str(tmp_path)
+    tracker_app.persistence.flush(wait=True)
+
+
+@pytest.fixture
+def client(data_dir):
+    return tracker_app.app.test_client()
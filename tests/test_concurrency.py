@@ -0,0 +1,101 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import app
+
+SESSIONS = 2000
+THREADS = 32
+
+
+def test_concurrent_session_ends_keep_exact_totals(client):
+    tracker = app.trackers.get(app.DEFAULT_USER)
+    session_ids = [tracker.start_session() for _ in range(SESSIONS)]
+    # Backdate the starts so every session has a measurable duration
+    for session_id in session_ids:
+        app.active_sessions.update(session_id, lambda session: session.update(start_time='2025-08-01T10:00:00'))
+    
+    def end(session_id):
+        response = app.app.test_client().post('/api/session/end', json={'session_id': session_id, 'topics': ['a']})
+        assert response.status_code == 200
+        return response.get_json()['session']['duration']
+    
+    with ThreadPoolExecutor(THREADS) as pool:
+        durations = list(pool.map(end, session_ids))
+    
+    progress = tracker.progress_data
+    assert progress['total_sessions'] == SESSIONS
+    assert abs(progress['total_hours'] - sum(durations)) < 1e-6
+    assert len(tracker.sessions_data) == SESSIONS
+    assert len({session.id for session in tracker.sessions_data}) == SESSIONS
+    assert not app.active_sessions.keys(tracker.user_id)
+    assert sum(totals['sessions'] for totals in tracker.week_totals.values()) == SESSIONS
+    
+    # What reached disk reloads to the same totals
+    app.persistence.flush(wait=True)
+    reloaded = app.ProgressTracker()
+    assert reloaded.progress_data['total_sessions'] == SESSIONS
+    assert abs(reloaded.progress_data['total_hours'] - sum(durations)) < 1e-6
+    assert len(reloaded.sessions_data) == SESSIONS
+
+
+def test_evicted_trackers_are_flushed_before_reload(client, monkeypatch):
+    monkeypatch.setattr(app, 'trackers', app.TrackerRegistry(max_loaded=1))
+    users = [f'user{i}' for i in range(4)]
+    
+    def add(index):
+        user_id = users[index % len(users)]
+        response = app.app.test_client().post(
+            '/api/sessions/bulk', json=[{'session_date': '2025-08-01T10:00:00', 'duration': 1}],
+            headers={'X-User-Id': user_id}
+        )
+        assert response.status_code == 200
+    
+    with ThreadPoolExecutor(THREADS) as pool:
+        list(pool.map(add, range(400)))
+    
+    app.trackers.flush_all()
+    for user_id in users:
+        reloaded = app.ProgressTracker(user_id=user_id)
+        assert reloaded.progress_data['total_sessions'] == 100
+        assert len(reloaded.sessions_data) == 100
+
+
+def test_held_tracker_is_not_evicted(data_dir):
+    registry = app.TrackerRegistry(max_loaded=1)
+    held = registry.acquire('alice')
+    registry.get('bob')
+    assert 'alice' in registry.loaded_users()
+    registry.release(held)
+    registry.get('carol')
+    assert registry.loaded_users() == ['carol']
+
+
+def test_cold_load_does_not_block_other_users(data_dir, monkeypatch):
+    registry = app.TrackerRegistry()
+    registry.get('bob')
+    release_load = threading.Event()
+    real_tracker = app.ProgressTracker
+    
+    def slow_tracker(user_id):
+        if user_id == 'alice':
+            release_load.wait(5)
+        return real_tracker(user_id=user_id)
+    
+    monkeypatch.setattr(app, 'ProgressTracker', slow_tracker)
+    with ThreadPoolExecutor(4) as pool:
+        alice = [pool.submit(registry.get, 'alice') for _ in range(3)]
+        assert registry.get('bob').user_id == 'bob'
+        assert not any(future.done() for future in alice)
+        release_load.set()
+        loaded = {id(future.result()) for future in alice}
+    assert len(loaded) == 1
+
+
+def test_event_stream_holds_tracker_until_closed(client):
+    session_id = client.post('/api/session/start').get_json()['session_id']
+    response = client.get(f'/api/session/stream/{session_id}', buffered=False)
+    next(iter(response.response))
+    entry = app.trackers._trackers[app.DEFAULT_USER]
+    assert entry[2] == 1
+    response.close()
+    assert entry[2] == 0
@@ -0,0 +1,54 @@
+import gc
+import json
+import tracemalloc
+
+import app
+import benchmark
+
+
+def traced_bytes(build):
+    """Bytes still allocated after build() returns, with its result kept alive"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = build()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del result
+    return size
+
+
+def test_session_records_use_less_memory_than_dicts(data_dir):
+    tracker = app.trackers.get(app.DEFAULT_USER)
+    entries = benchmark.generate_sessions(1, 365, 10)
+    lines = [
+        json.dumps(tracker.build_manual_session(**tracker.validate_session_entry(entry))) for entry in entries
+    ]
+    
+    dict_bytes = traced_bytes(lambda: [json.loads(line) for line in lines]) / len(lines)
+    record_bytes = traced_bytes(lambda: [app.SessionRecord.from_dict(json.loads(line)) for line in lines]) / len(lines)
+    assert record_bytes < dict_bytes * 0.5, (dict_bytes, record_bytes)
+
+
+def test_session_record_round_trip():
+    sessions = [
+        {
+            'id': 'a', 'user_id': 'default', 'start_time': '2025-08-01T10:00:00', 'end_time': '2025-08-01T11:30:00',
+            'duration': 1.5, 'notes': 'read', 'topics': ['SQL'], 'mood': 'focused', 'difficulty': 3,
+            'status': 'completed', 'paused_time': 0
+        },
+        {
+            'id': 'b', 'user_id': 'default', 'start_time': '2025-08-02T09:00:00.123456',
+            'end_time': '2025-08-02T09:00:00.123456', 'duration': 2.0, 'notes': '', 'topics': [], 'mood': '',
+            'difficulty': 5, 'status': 'completed', 'manual_entry': True
+        },
+        # Offsets and unknown keys are kept verbatim
+        {
+            'id': 'c', 'user_id': 'default', 'start_time': '2025-08-03T09:00:00+02:00', 'end_time': None,
+            'duration': 0.25, 'notes': 'x', 'topics': ['a', 'b'], 'mood': 'tired', 'difficulty': None,
+            'status': 'completed', 'source': 'import'
+        }
+    ]
+    for session in sessions:
+        assert app.SessionRecord.from_dict(session).to_dict() == session